@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark infer_app_intent read prefetching against simulated per-file read latency.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import infer_app_intent  # noqa: E402
+
+
+SAMPLE_LINES = [
+    "navigation.navigate('Checkout')",
+    "GoRoute(path: '/orders/:id')",
+    "export const LoginScreen = () => <Button mode='contained'>Sign in</Button>;",
+    "import { Card } from 'react-native-paper';",
+    "const theme = useTheme(); // brand color tokens",
+    "fun ProductDetail() = composable(\"detail\") { }",
+]
+
+
+class LatencyFilesystem:
+    """Stand-in for a network mount: every read waits a fixed round-trip first."""
+
+    def __init__(self, latency_seconds: float):
+        self.latency_seconds = latency_seconds
+        self.read_source = infer_app_intent.read_source
+
+    def __call__(self, path: Path, max_bytes: int = infer_app_intent.DEFAULT_MAX_FILE_BYTES):
+        time.sleep(self.latency_seconds)
+        return self.read_source(path, max_bytes)
+
+    def __enter__(self):
+        infer_app_intent.read_source = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        infer_app_intent.read_source = self.read_source
+
+
+def build_fixture(root: Path, file_count: int, lines_per_file: int) -> None:
+    for index in range(file_count):
+        folder = root / "src" / ("screens" if index % 2 else "features")
+        folder.mkdir(parents=True, exist_ok=True)
+        body = "\n".join(
+            f"{SAMPLE_LINES[(index + line) % len(SAMPLE_LINES)]} // {index}-{line}"
+            for line in range(lines_per_file)
+        )
+        (folder / f"Screen{index}.tsx").write_text(body + "\n", encoding="utf-8")
+
+
+def run_scan(files: List[Path], read_threads: int) -> Tuple[float, str]:
+    started = time.perf_counter()
+    state = infer_app_intent.new_scan_state()
+    records = infer_app_intent.iter_scan_records(
+        files, 1, infer_app_intent.DEFAULT_MAX_FILE_BYTES, True, read_threads
+    )
+    infer_app_intent.add_scan_records(state, records)
+    return time.perf_counter() - started, infer_app_intent.render_report(state)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark read prefetching under read latency.")
+    parser.add_argument("--repo", help="Existing repository to scan instead of a generated fixture")
+    parser.add_argument("--files", type=int, default=200, help="Generated fixture file count")
+    parser.add_argument("--lines", type=int, default=200, help="Lines per generated file")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Simulated latency per read")
+    parser.add_argument(
+        "--threads", default="0,2,8,16", help="Comma-separated --read-threads values to compare"
+    )
+    args = parser.parse_args()
+
+    thread_counts = [int(value) for value in args.threads.split(",") if value.strip()]
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.repo:
+            repo = Path(args.repo)
+        else:
+            repo = Path(tmp)
+            build_fixture(repo, args.files, args.lines)
+        files = infer_app_intent.iter_source_files(repo)
+
+        print(f"Files: {len(files)}")
+        print(f"Simulated read latency: {args.latency_ms:.1f} ms")
+        print("")
+        print("| read threads | seconds | speedup |")
+        print("|---|---|---|")
+        baseline_seconds = None
+        baseline_report = None
+        with LatencyFilesystem(args.latency_ms / 1000.0):
+            for threads in thread_counts:
+                seconds, report = run_scan(files, threads)
+                if baseline_seconds is None:
+                    baseline_seconds, baseline_report = seconds, report
+                elif report != baseline_report:
+                    print(f"ERROR: report with {threads} read threads differs from the first run")
+                    return 1
+                print(f"| {threads} | {seconds:.3f} | {baseline_seconds / seconds:.1f}x |")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
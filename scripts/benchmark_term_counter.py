@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Check that infer_app_intent's bounded purpose-term counter ranks the same top terms as exact counting.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import infer_app_intent  # noqa: E402
+
+
+DOMAIN_TERMS = [
+    "order", "checkout", "payment", "product", "wallet", "account", "booking", "invoice",
+    "profile", "message", "delivery", "schedule", "ticket", "review", "basket", "coupon",
+    "address", "rating", "subscription", "shipment", "catalog", "refund", "receipt", "session",
+]
+
+
+def build_fixture(root: Path, file_count: int, lines_per_file: int, seed: int) -> None:
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(DOMAIN_TERMS))]
+    for index in range(file_count):
+        folder = root / "src" / ("screens" if index % 2 else "features")
+        folder.mkdir(parents=True, exist_ok=True)
+        lines = []
+        for line in range(lines_per_file):
+            words = rng.choices(DOMAIN_TERMS, weights, k=4)
+            words.append(f"rare{index}x{line}x{rng.randrange(1 << 30)}")
+            lines.append("const " + "_".join(words[:2]) + " = " + " + ".join(words[2:]) + ";")
+        (folder / f"Screen{index}.tsx").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def top_terms(counter, count: int) -> List[Tuple[str, int]]:
+    return sorted(counter.most_common(), key=lambda item: (-item[1], item[0]))[:count]
+
+
+def compare_tree(repo: Path, label: str, capacities: List[int], top: int) -> bool:
+    started = time.perf_counter()
+    exact = infer_app_intent.scan_repo(repo, term_capacity=0)["tokens"]
+    exact_seconds = time.perf_counter() - started
+    expected = top_terms(exact, top)
+    print(f"| {label} | exact | {len(exact)} | {exact_seconds:.3f} | - |")
+
+    matched = True
+    for capacity in capacities:
+        started = time.perf_counter()
+        bounded = infer_app_intent.scan_repo(repo, term_capacity=capacity)["tokens"]
+        seconds = time.perf_counter() - started
+        same = top_terms(bounded, top) == expected
+        matched = matched and same
+        print(f"| {label} | {capacity} | {len(bounded.counts)} | {seconds:.3f} | {'yes' if same else 'NO'} |")
+    return matched
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare bounded and exact purpose-term counting.")
+    parser.add_argument(
+        "--repo",
+        action="append",
+        default=[],
+        help="Existing repository to compare as well as the generated fixture (repeatable)",
+    )
+    parser.add_argument("--files", type=int, default=200, help="Generated fixture file count")
+    parser.add_argument("--lines", type=int, default=200, help="Lines per generated file")
+    parser.add_argument("--seed", type=int, default=7, help="Generated fixture random seed")
+    parser.add_argument("--top", type=int, default=20, help="Top terms that must match")
+    parser.add_argument(
+        "--capacities",
+        default=f"256,{infer_app_intent.DEFAULT_TERM_CAPACITY}",
+        help="Comma-separated --term-capacity values to compare",
+    )
+    args = parser.parse_args()
+
+    capacities = [int(value) for value in args.capacities.split(",") if value.strip()]
+    if any(capacity <= 0 for capacity in capacities):
+        print("ERROR: --capacities must be positive integers")
+        return 2
+
+    print("| tree | capacity | terms kept | seconds | top terms match |")
+    print("|---|---|---|---|---|")
+    with tempfile.TemporaryDirectory() as tmp:
+        build_fixture(Path(tmp), args.files, args.lines, args.seed)
+        matched = compare_tree(Path(tmp), "generated", capacities, args.top)
+    for repo in args.repo:
+        matched = compare_tree(Path(repo), repo, capacities, args.top) and matched
+
+    if not matched:
+        print(f"ERROR: bounded top {args.top} terms differ from exact counting")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
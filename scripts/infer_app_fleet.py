@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Run app intent inference across many repositories and write one JSONL record per repo.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import infer_app_intent  # noqa: E402
+
+
+def expand_repo_paths(patterns: list[str], list_file: str = "") -> list[str]:
+    entries = list(patterns)
+    if list_file:
+        for line in Path(list_file).read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                entries.append(line)
+
+    repos = set()
+    for entry in entries:
+        matches = glob.glob(os.path.expanduser(entry)) if glob.has_magic(entry) else [entry]
+        for match in matches:
+            path = Path(os.path.expanduser(match))
+            if path.is_dir():
+                repos.add(str(path.resolve()))
+    return sorted(repos)
+
+
+def load_finished(output: Path, retry_errors: bool) -> set[str]:
+    if not output.exists():
+        return set()
+    with output.open("r+b") as handle:
+        data = handle.read()
+        if data and not data.endswith(b"\n"):
+            handle.truncate(data.rfind(b"\n") + 1)
+
+    finished = set()
+    for line in data.decode("utf-8", errors="ignore").splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(record, dict) or "repo" not in record:
+            continue
+        worker_failed = str(record.get("error", "")).startswith("worker ")
+        if record.get("status") == "ok" or not (retry_errors or worker_failed):
+            finished.add(record["repo"])
+        else:
+            finished.discard(record["repo"])
+    return finished
+
+
+def infer_repo(repo: str, options: dict) -> dict:
+    started = time.perf_counter()
+    try:
+        state = infer_app_intent.scan_repo(Path(repo), profile=True, **options)
+        stack = infer_app_intent.infer_stack(state)
+    except Exception as exc:
+        return {
+            "repo": repo,
+            "status": "error",
+            "error": f"{type(exc).__name__}: {exc}",
+            "timings": {"total": round(time.perf_counter() - started, 4)},
+        }
+
+    record = {"repo": repo, "status": "ok"}
+    for dimension in infer_app_intent.MANIFEST_DIMENSIONS:
+        value, confidence, evidence = stack[dimension]
+        record[dimension] = value
+        record[f"{dimension}_confidence"] = confidence
+        record[f"{dimension}_evidence"] = evidence
+    record["operations"] = [
+        {"operation": op, "label": infer_app_intent.op_label(op), "confidence": confidence}
+        for op, confidence in stack["operations"]
+    ]
+    record["purpose"] = infer_app_intent.purpose_from_terms(state["tokens"])
+    record["purpose_confidence"] = infer_app_intent.confidence_from_hits(
+        state["route_count"] + len(stack["operations"])
+    )
+    record["files_scanned"] = state["scanned"]
+    record["routes"] = len(state["route_index"])
+    record["manifest_resolved"] = sorted(state["manifests"]["resolved"])
+    record["full_scan"] = state["manifests"]["full_scan"]
+    sample = state["sample"]
+    if sample is not None:
+        record["coverage"] = round(sample["files"] / sample["total"], 4) if sample["total"] else 1.0
+        record["stopped_by"] = sample["stopped"]
+    timings = {
+        phase: round(seconds, 4)
+        for phase, (seconds, _) in state["profile"]["phases"].items()
+        if phase != "render"
+    }
+    timings["total"] = round(time.perf_counter() - started, 4)
+    record["timings"] = timings
+    return record
+
+
+def iter_pool_results(function, items: list, jobs: int, *args):
+    queue = deque(items)
+    suspects: deque = deque()
+    while queue or suspects:
+        while suspects:
+            item = suspects.popleft()
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                future = pool.submit(function, item, *args)
+                try:
+                    yield item, future.result(), None
+                except BrokenProcessPool as exc:
+                    yield item, None, f"worker crashed: {exc}"
+                except Exception as exc:
+                    yield item, None, f"worker failed: {exc}"
+
+        broken = False
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            in_flight = {}
+            while in_flight or (queue and not broken):
+                while queue and not broken and len(in_flight) < jobs:
+                    item = queue.popleft()
+                    in_flight[pool.submit(function, item, *args)] = item
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        suspects.append(item)
+                        continue
+                    except Exception as exc:
+                        yield item, None, f"worker failed: {exc}"
+                        continue
+                    yield item, result, None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Infer app intent across many repositories.")
+    parser.add_argument("repos", nargs="*", help="Repository paths or globs (for example ~/src/*)")
+    parser.add_argument("--list", default="", help="File with one repository path or glob per line")
+    parser.add_argument("--output", required=True, help="JSONL output path, appended to on resume")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes, one repository each (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--retry-errors",
+        action="store_true",
+        help="Rerun repositories whose last record is an error instead of skipping them",
+    )
+    parser.add_argument("--git", action="store_true", help="List files from each repo's git index")
+    parser.add_argument(
+        "--stack-only",
+        action="store_true",
+        help="Skip the full-text scan where manifests resolve the whole stack",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=0.0,
+        help="Per-repo time budget; budgeted repos are sampled (0 = no limit)",
+    )
+    parser.add_argument(
+        "--max-files",
+        type=int,
+        default=0,
+        help="Per-repo file budget, most informative files first (0 = no limit)",
+    )
+    parser.add_argument(
+        "--early-stop",
+        action="store_true",
+        help="Stop each repo once the stack and operations reach high confidence",
+    )
+    parser.add_argument(
+        "--max-file-bytes",
+        type=int,
+        default=infer_app_intent.DEFAULT_MAX_FILE_BYTES,
+        help="Per-file read budget in bytes",
+    )
+    args = parser.parse_args()
+
+    if args.jobs < 0:
+        print("ERROR: --jobs must be 0 or a positive integer")
+        return 2
+    if args.max_seconds < 0 or args.max_files < 0:
+        print("ERROR: --max-seconds and --max-files must be 0 or positive")
+        return 2
+    if args.max_file_bytes <= 0:
+        print("ERROR: --max-file-bytes must be a positive integer")
+        return 2
+    if args.list and not Path(args.list).is_file():
+        print(f"ERROR: repo list is invalid: {args.list}")
+        return 2
+
+    repos = expand_repo_paths(args.repos, args.list)
+    if not repos:
+        print("ERROR: no repository directories matched")
+        return 2
+
+    output = Path(args.output)
+    finished = load_finished(output, args.retry_errors)
+    pending = [repo for repo in repos if repo not in finished]
+    print(f"Repositories: {len(repos)} matched, {len(repos) - len(pending)} already recorded, {len(pending)} to run")
+
+    options = {
+        "use_git": args.git,
+        "stack_only": args.stack_only,
+        "max_file_bytes": args.max_file_bytes,
+        "max_seconds": args.max_seconds,
+        "max_files": args.max_files,
+        "early_stop": args.early_stop,
+    }
+    errors = 0
+    jobs = args.jobs or os.cpu_count() or 1
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("a", encoding="utf-8") as handle:
+        results = iter_pool_results(infer_repo, pending, jobs, options)
+        for done, (repo, record, failure) in enumerate(results, start=1):
+            if failure is not None:
+                record = {"repo": repo, "status": "error", "error": failure}
+            if record["status"] != "ok":
+                errors += 1
+            handle.write(json.dumps(record, sort_keys=True) + "\n")
+            handle.flush()
+            print(f"[{done}/{len(pending)}] {record['status']}: {record['repo']}")
+
+    print(f"Wrote {len(pending)} records to {output} ({errors} errors)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,9 +4,28 @@ Infer mobile app purpose and ordered user operations from code evidence.
 """
 
 import argparse
+import ctypes
+import errno
+import fnmatch
+import hashlib
+import heapq
+import json
+import mmap
+import os
 import re
-from collections import Counter, defaultdict
+import select
+import subprocess
+import sys
+import tarfile
+import time
+import zipfile
+import zlib
+from array import array
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Optional
 
 
 ALLOWED_EXTENSIONS = {
@@ -48,6 +67,7 @@ SKIP_DIRS = {
     "ios/Pods",
     "android/build",
     ".gradle",
+    ".intent-cache",
 }
 
 SKIP_FILENAMES = {
@@ -70,6 +90,54 @@ APP_DIR_HINTS = {
     "module",
 }
 
+CACHE_VERSION = 1
+DEFAULT_CACHE_MAX_MB = 64
+
+DEFAULT_MAX_FILE_BYTES = 2 * 1024 * 1024
+MMAP_THRESHOLD_BYTES = 1024 * 1024
+SNIFF_BYTES = 8192
+MINIFIED_MIN_SAMPLE_BYTES = 2048
+MINIFIED_AVG_LINE_BYTES = 400
+READ_NOTES_PREVIEW = 20
+
+DEFAULT_TERM_CAPACITY = 50000
+
+READ_QUEUE_FACTOR = 2
+SHARD_QUEUE_FACTOR = 2
+MAX_SHARD_FILES = 256
+
+SAMPLE_STOP_REASONS = {
+    "file budget": "the --max-files budget",
+    "time budget": "the --max-seconds budget",
+    "confidence": "early stop after stack and operations reached high confidence",
+}
+
+PRIORITY_DIR_HINTS = {
+    "navigation",
+    "navigator",
+    "navigators",
+    "router",
+    "routes",
+    "routing",
+    "screens",
+    "screen",
+    "pages",
+    "page",
+}
+
+APP_HOST_DIRS = {"android", "ios", "linux", "macos", "web", "windows"}
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+
+WATCH_DEBOUNCE_MS = 200
+WATCH_POLL_SECONDS = 1.0
+INOTIFY_MASK = 0x2 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200 | 0x400 | 0x800
+ARTIFACT_REPORT_NAME = "01-intent-inference.md"
+
+PROFILE_PHASES = ["walk", "manifests", "read", "routes", "tokens", "signals", "render"]
+FILE_PHASES = ["read", "routes", "tokens", "signals"]
+DEFAULT_PROFILE_TOP = 10
+
 RUNTIME_SIGNALS = {
     "react_native": ["react-native", "@react-navigation", "native-base", "react native paper"],
     "flutter": ["flutter", "materialapp", "cupertinoapp", "go_router"],
@@ -108,81 +176,590 @@ OPERATION_KEYWORDS = {
     "manage": ["settings", "history", "orders", "account", "profile", "manage"],
 }
 
+SIGNAL_TABLES = {
+    "runtime": RUNTIME_SIGNALS,
+    "design_system": DESIGN_SYSTEM_SIGNALS,
+    "ui_library": UI_LIBRARY_SIGNALS,
+    "operations": OPERATION_KEYWORDS,
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9_-]{2,}")
+
+CASE_UNSAFE_UTF8 = (b"\xc4\xb0", b"\xe2\x84\xaa")
+
+STR_ONLY_WHITESPACE = (
+    "\x1c\x1d\x1e\x1f\x85\xa0\u1680"
+    + "".join(map(chr, range(0x2000, 0x200B)))
+    + "\u2028\u2029\u202f\u205f\u3000"
+)
+SCAN_UNSAFE_ASCII = tuple(char.encode("ascii") for char in STR_ONLY_WHITESPACE if char < "\x80")
+SCAN_UNSAFE_UTF8 = CASE_UNSAFE_UTF8 + tuple(
+    char.encode("utf-8") for char in STR_ONLY_WHITESPACE if char >= "\x80"
+)
+
+ROUTE_REGEX = (
+    r"(?P<kind>goroute\(\s*path:|navigate\(|composable\(|route\(|name:|path:)"
+    r"\s*['\"](?P<value>[^'\"]+)['\"]"
+)
+ROUTE_PATTERN = re.compile(ROUTE_REGEX)
+ROUTE_PATTERN_ANY_CASE = re.compile(ROUTE_REGEX, re.IGNORECASE)
+
+ROUTE_BYTES_PATTERN = re.compile(ROUTE_REGEX.encode("ascii"))
+
+ROUTE_VALUE_PATTERN = re.compile(r"^[a-zA-Z0-9_/\-:. ]+$")
+
+ROUTE_KINDS = {
+    "gorou": "go_route",
+    "navig": "navigate",
+    "compo": "composable",
+    "route": "route",
+    "name:": "name",
+    "path:": "path",
+}
+
+ROUTE_SAMPLES = 12
+
+MANIFEST_KINDS = {
+    "package.json": "npm",
+    "pubspec.yaml": "pub",
+    "build.gradle": "gradle",
+    "build.gradle.kts": "gradle",
+    "podfile": "cocoapods",
+    "package.swift": "swiftpm",
+}
+
+MANIFEST_SIGNALS = {
+    "npm": {
+        "runtime": {
+            "react_native": ["react-native", "expo"],
+            "ionic": ["@ionic/", "@capacitor/core"],
+        },
+        "design_system": {
+            "material_3": ["react-native-paper"],
+        },
+        "ui_library": {
+            "react-native-paper": ["react-native-paper"],
+            "nativebase": ["native-base"],
+            "ui-kitten": ["@ui-kitten/"],
+            "react-native-elements": ["react-native-elements", "@rneui/"],
+            "tamagui": ["tamagui", "@tamagui/"],
+            "gluestack": ["@gluestack-ui/"],
+            "ionic-ui": ["@ionic/react", "@ionic/angular", "@ionic/vue"],
+        },
+    },
+    "pub": {
+        "runtime": {"flutter": ["flutter"]},
+        "design_system": {"material_3": ["flutter.uses-material-design"]},
+        "ui_library": {"flutter-material": ["flutter.uses-material-design"]},
+    },
+    "gradle": {
+        "runtime": {"android_native": ["androidx.compose.", "androidx.compose:", "buildFeatures.compose"]},
+        "design_system": {"material_3": ["androidx.compose.material3", "androidx.compose.material3:"]},
+        "ui_library": {
+            "jetpack-compose": ["androidx.compose.", "androidx.compose:", "buildFeatures.compose"]
+        },
+    },
+    "cocoapods": {
+        "runtime": {"ios_native": ["platform:ios"]},
+        "design_system": {"apple_hig": ["platform:ios"]},
+    },
+    "swiftpm": {
+        "runtime": {"ios_native": ["platform:ios"]},
+        "design_system": {"apple_hig": ["platform:ios"]},
+    },
+}
+
+MANIFEST_RUNTIME_PRIORITY = ["react_native", "flutter", "ionic", "android_native", "ios_native"]
+MANIFEST_DIMENSIONS = ["runtime", "design_system", "ui_library"]
+
+NPM_DEPENDENCY_FIELDS = ["dependencies"]
+PUBSPEC_DEPENDENCY_SECTIONS = {"dependencies", "dev_dependencies", "dependency_overrides"}
+
+GRADLE_COORDINATE_PATTERN = re.compile(r"['\"]([A-Za-z0-9_.\-]+:[A-Za-z0-9_.\-]+)(?::[^'\"]*)?['\"]")
+GRADLE_CATALOG_PATTERN = re.compile(r"\blibs\.([A-Za-z0-9_.]+)")
+GRADLE_COMPOSE_PATTERN = re.compile(r"\bcompose\s*=?\s*true\b")
+PODFILE_POD_PATTERN = re.compile(r"^\s*pod\s+['\"]([^'\"]+)['\"]", re.MULTILINE)
+PODFILE_IOS_PATTERN = re.compile(r"^\s*platform\s+:ios\b", re.MULTILINE)
+SWIFTPM_IOS_PATTERN = re.compile(r"\.iOS\s*\(")
+
+
+def trie_pattern(words: list[str]) -> str:
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        terminal = "" in node
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if terminal else group
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """
+    Find every signal keyword in one pass: a trie-shaped regex is probed at each offset
+    and shorter keywords sharing the matched start come from a prefix closure.
+    """
+
+    def __init__(self, tables: dict[str, dict[str, list[str]]]):
+        self.tables = tables
+        owners: dict[str, list[tuple[str, str]]] = defaultdict(list)
+        for dimension, signals in tables.items():
+            for key, keywords in signals.items():
+                for keyword in keywords:
+                    owners[keyword].append((dimension, key))
+        self.keywords = sorted(owners)
+        self.owners = dict(owners)
+        self.prefixes = {
+            keyword: [other for other in self.keywords if keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+        self.pattern = re.compile("(?=(" + trie_pattern(self.keywords) + "))")
+        self.bytes_pattern = re.compile(self.pattern.pattern.encode("ascii"))
+
+    def find_keywords(self, lowered) -> set[str]:
+        if isinstance(lowered, bytes):
+            longest = {found.decode("ascii") for found in set(self.bytes_pattern.findall(lowered))}
+        else:
+            longest = {match.group(1) for match in self.pattern.finditer(lowered)}
+        return {keyword for found in longest for keyword in self.prefixes[found]}
+
+    def match(self, lowered) -> dict[str, set[str]]:
+        hits: dict[str, set[str]] = {dimension: set() for dimension in self.tables}
+        for keyword in self.find_keywords(lowered):
+            for dimension, key in self.owners[keyword]:
+                hits[dimension].add(key)
+        return hits
+
+
+SIGNAL_MATCHER = KeywordMatcher(SIGNAL_TABLES)
+
+
+class TermCounter:
+    """
+    Bounded heavy-hitters counter (Space-Saving with batch eviction). Counts are
+    overestimates by at most `floor`; terms above the floor are never evicted.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        self.floor = 0
 
-def should_skip(path: Path) -> bool:
-    text = str(path).replace("\\", "/").lower()
-    return any(skip in text for skip in SKIP_DIRS) or path.name.lower() in SKIP_FILENAMES
+    def update(self, counts) -> None:
+        for term, count in counts.items():
+            if term in self.counts:
+                self.counts[term] += count
+            else:
+                self.counts[term] = self.floor + count
+        if len(self.counts) > 2 * self.capacity:
+            self.evict()
 
+    def evict(self) -> None:
+        kept = heapq.nlargest(self.capacity + 1, self.counts.values())
+        threshold = kept[-1]
+        self.floor = max(self.floor, threshold)
+        self.counts = {term: count for term, count in self.counts.items() if count > threshold}
 
-def iter_source_files(root: Path):
-    candidates = []
-    for path in root.rglob("*"):
-        if path.is_dir():
+    def most_common(self, n: Optional[int] = None) -> list[tuple[str, int]]:
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return ranked if n is None else ranked[:n]
+
+
+def new_term_counter(capacity: int = DEFAULT_TERM_CAPACITY):
+    return TermCounter(capacity) if capacity > 0 else Counter()
+
+
+SKIP_DIR_PATHS = sorted({tuple(skip.lower().split("/")) for skip in SKIP_DIRS})
+
+
+def should_prune(dir_parts: tuple[str, ...]) -> bool:
+    return any(dir_parts[-len(skip) :] == skip for skip in SKIP_DIR_PATHS)
+
+
+def is_source_name(name: str) -> bool:
+    lowered = name.lower()
+    return os.path.splitext(lowered)[1] in ALLOWED_EXTENSIONS or lowered in ALLOWED_FILENAMES
+
+
+def should_skip(rel_parts: tuple[str, ...]) -> bool:
+    if rel_parts[-1] in SKIP_FILENAMES:
+        return True
+    return any(should_prune(rel_parts[:depth]) for depth in range(1, len(rel_parts)))
+
+
+def walk_order_key(rel_path: str) -> tuple:
+    parts = rel_path.split("/")
+    return tuple((1, part) for part in parts[:-1]) + ((0, parts[-1]),)
+
+
+def new_walk_stats() -> dict:
+    return {
+        "source": "filesystem",
+        "dirs_visited": 0,
+        "dirs_pruned": 0,
+        "files_considered": 0,
+        "hinted_files": 0,
+        "unhinted_files": 0,
+    }
+
+
+def walk_source_files(root: Path, stats: dict) -> tuple[list[Path], list[Path]]:
+    hinted: list[Path] = []
+    unhinted: list[Path] = []
+    stack: list[tuple[str, tuple[str, ...], bool]] = [(str(root), (), False)]
+    while stack:
+        directory, dir_parts, in_hint = stack.pop()
+        stats["dirs_visited"] += 1
+        try:
+            with os.scandir(directory) as scanner:
+                dir_entries = sorted(scanner, key=lambda entry: entry.name)
+        except OSError:
             continue
-        if should_skip(path):
+
+        subdirs = []
+        for entry in dir_entries:
+            name = entry.name.lower()
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                parts = dir_parts + (name,)
+                if should_prune(parts):
+                    stats["dirs_pruned"] += 1
+                    continue
+                subdirs.append((entry.path, parts, in_hint or name in APP_DIR_HINTS))
+                continue
+            stats["files_considered"] += 1
+            if name in SKIP_FILENAMES or not is_source_name(name):
+                continue
+            if in_hint:
+                hinted.append(Path(entry.path))
+            else:
+                unhinted.append(Path(entry.path))
+        stack.extend(reversed(subdirs))
+
+    stats["hinted_files"] = len(hinted)
+    stats["unhinted_files"] = len(unhinted)
+    return hinted, unhinted
+
+
+def classify_listed_files(
+    root: Path, rel_paths: list[str], stats: dict
+) -> tuple[list[Path], list[Path]]:
+    hinted: list[Path] = []
+    unhinted: list[Path] = []
+    for rel_path in sorted(rel_paths, key=walk_order_key):
+        stats["files_considered"] += 1
+        rel_parts = tuple(part.lower() for part in rel_path.split("/"))
+        if should_skip(rel_parts) or not is_source_name(rel_parts[-1]):
             continue
-        if path.suffix.lower() in ALLOWED_EXTENSIONS or path.name.lower() in ALLOWED_FILENAMES:
-            candidates.append(path)
+        if any(part in APP_DIR_HINTS for part in rel_parts[:-1]):
+            hinted.append(root.joinpath(*rel_path.split("/")))
+        else:
+            unhinted.append(root.joinpath(*rel_path.split("/")))
+    stats["hinted_files"] = len(hinted)
+    stats["unhinted_files"] = len(unhinted)
+    return hinted, unhinted
 
-    hinted = []
-    for path in candidates:
-        try:
-            parts = [part.lower() for part in path.relative_to(root).parts[:-1]]
-        except Exception:
-            parts = [part.lower() for part in path.parts[:-1]]
-        if any(part in APP_DIR_HINTS for part in parts):
-            hinted.append(path)
 
+def run_git(repo: Path, *args: str) -> str:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo), *args], capture_output=True, check=False
+        )
+    except OSError as exc:
+        raise ValueError(f"git is not available: {exc}") from exc
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", errors="replace").strip()
+        raise ValueError(f"git {args[0]} failed: {message}")
+    return result.stdout.decode("utf-8", errors="surrogateescape")
+
+
+def split_git_paths(output: str) -> list[str]:
+    return sorted({name for name in output.split("\0") if name})
+
+
+def git_listed_files(repo: Path) -> list[str]:
+    return split_git_paths(
+        run_git(repo, "ls-files", "-z", "--cached", "--others", "--exclude-standard")
+    )
+
+
+def git_changed_files(repo: Path, commit: str) -> set[str]:
+    changed = split_git_paths(run_git(repo, "diff", "--name-only", "--relative", "-z", commit, "--"))
+    untracked = split_git_paths(run_git(repo, "ls-files", "-z", "--others", "--exclude-standard"))
+    return set(changed) | set(untracked)
+
+
+def git_commit(repo: Path, ref: str) -> str:
+    return run_git(repo, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}").strip()
+
+
+def git_worktree_clean(repo: Path) -> bool:
+    return not run_git(repo, "status", "--porcelain", "-z", "--untracked-files=normal", "--", ".")
+
+
+def list_source_files(
+    root: Path, stats: Optional[dict] = None, use_git: bool = False
+) -> tuple[list[Path], list[Path]]:
+    stats = new_walk_stats() if stats is None else stats
+    if use_git:
+        stats["source"] = "git"
+        return classify_listed_files(root, git_listed_files(root), stats)
+    return walk_source_files(root, stats)
+
+
+def iter_source_files(root: Path, stats: Optional[dict] = None, use_git: bool = False) -> list[Path]:
+    hinted, unhinted = list_source_files(root, stats, use_git)
     if hinted:
         return hinted
-    return candidates
+    return unhinted
 
 
-def safe_read(path: Path) -> str:
+def safe_read_bytes(path: Path) -> bytes:
     try:
-        return path.read_text(encoding="utf-8", errors="ignore")
+        return path.read_bytes()
     except Exception:
-        return ""
+        return b""
 
 
-def collect_routes(text: str) -> list[str]:
-    patterns = [
-        r"navigate\(\s*['\"]([^'\"]+)['\"]",
-        r"name:\s*['\"]([^'\"]+)['\"]",
-        r"path:\s*['\"]([^'\"]+)['\"]",
-        r"route\(\s*['\"]([^'\"]+)['\"]",
-        r"GoRoute\(\s*path:\s*['\"]([^'\"]+)['\"]",
-        r"composable\(\s*['\"]([^'\"]+)['\"]",
-    ]
+def looks_minified(name: str, sample: bytes) -> bool:
+    if ".min." in name:
+        return True
+    if len(sample) < MINIFIED_MIN_SAMPLE_BYTES:
+        return False
+    return len(sample) / (sample.count(b"\n") + 1) > MINIFIED_AVG_LINE_BYTES
+
+
+def sniff_and_slice(name: str, buffer, size: int, max_bytes: int) -> tuple[bytes, Optional[str]]:
+    sample = bytes(buffer[:SNIFF_BYTES])
+    if b"\0" in sample:
+        return b"", "skipped: binary content"
+    if name not in ALLOWED_FILENAMES and looks_minified(name, sample):
+        return b"", "skipped: minified or generated single-line content"
+    if size > max_bytes:
+        return bytes(buffer[:max_bytes]), f"truncated: read {max_bytes} of {size} bytes"
+    return bytes(buffer), None
+
+
+def read_source(path: Path, max_bytes: int = DEFAULT_MAX_FILE_BYTES) -> tuple[bytes, Optional[str]]:
+    name = path.name.lower()
+    try:
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size > MMAP_THRESHOLD_BYTES:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return sniff_and_slice(name, mapped, size, max_bytes)
+            return sniff_and_slice(name, handle.read(max_bytes), size, max_bytes)
+    except (OSError, ValueError):
+        return b"", "skipped: unreadable"
+
+
+def collect_routes(text: str, lowered: Optional[str] = None) -> list[tuple[str, str, int]]:
+    if lowered is not None and len(lowered) == len(text):
+        matches = ROUTE_PATTERN.finditer(lowered)
+    else:
+        matches = ROUTE_PATTERN_ANY_CASE.finditer(text)
+    routes = []
+    line = 1
+    last = 0
+    for match in matches:
+        value = text[match.start("value") : match.end("value")].strip()
+        if not value or len(value) > 64 or not ROUTE_VALUE_PATTERN.match(value):
+            continue
+        start = match.start()
+        line += text.count("\n", last, start)
+        last = start
+        routes.append((value, ROUTE_KINDS[match.group("kind").lower()[:5]], line))
+    return routes
+
+
+def collect_routes_bytes(data: bytes, lowered: bytes) -> list[tuple[str, str, int]]:
     routes = []
-    for pattern in patterns:
-        routes.extend(re.findall(pattern, text, flags=re.IGNORECASE))
-    cleaned = []
-    for route in routes:
-        value = route.strip()
-        if not value:
+    line = 1
+    last = 0
+    for match in ROUTE_BYTES_PATTERN.finditer(lowered):
+        value = data[match.start("value") : match.end("value")].decode("utf-8", errors="ignore").strip()
+        if not value or len(value) > 64 or not ROUTE_VALUE_PATTERN.match(value):
+            continue
+        start = match.start()
+        line += data.count(b"\n", last, start)
+        last = start
+        routes.append((value, ROUTE_KINDS[match.group("kind")[:5].decode("ascii")], line))
+    return routes
+
+
+def npm_dependencies(text: str) -> set[str]:
+    try:
+        document = json.loads(text)
+    except ValueError:
+        return set()
+    names: set[str] = set()
+    if isinstance(document, dict):
+        for field in NPM_DEPENDENCY_FIELDS:
+            block = document.get(field)
+            if isinstance(block, dict):
+                names.update(block)
+    return names
+
+
+def pubspec_dependencies(text: str) -> set[str]:
+    names: set[str] = set()
+    section = None
+    child_indent = None
+    for raw_line in text.splitlines():
+        line = raw_line.split("#", 1)[0].rstrip()
+        if not line.strip():
             continue
-        if len(value) > 64:
+        indent = len(line) - len(line.lstrip())
+        key, _, value = line.strip().partition(":")
+        if indent == 0:
+            section = key
+            child_indent = None
             continue
-        if not re.match(r"^[a-zA-Z0-9_/\-:. ]+$", value):
+        if child_indent is None:
+            child_indent = indent
+        if indent != child_indent:
             continue
-        cleaned.append(value)
-    return cleaned
+        if section in PUBSPEC_DEPENDENCY_SECTIONS:
+            names.add(key)
+        elif section == "flutter" and key == "uses-material-design" and value.strip() == "true":
+            names.add("flutter.uses-material-design")
+    return names
+
+
+def gradle_dependencies(text: str) -> set[str]:
+    names = set(GRADLE_COORDINATE_PATTERN.findall(text))
+    names.update(GRADLE_CATALOG_PATTERN.findall(text))
+    if GRADLE_COMPOSE_PATTERN.search(text):
+        names.add("buildFeatures.compose")
+    return names
+
+
+def podfile_dependencies(text: str) -> set[str]:
+    names = set(PODFILE_POD_PATTERN.findall(text))
+    if PODFILE_IOS_PATTERN.search(text):
+        names.add("platform:ios")
+    return names
+
+
+def swiftpm_dependencies(text: str) -> set[str]:
+    return {"platform:ios"} if SWIFTPM_IOS_PATTERN.search(text) else set()
+
+
+MANIFEST_PARSERS = {
+    "npm": npm_dependencies,
+    "pub": pubspec_dependencies,
+    "gradle": gradle_dependencies,
+    "cocoapods": podfile_dependencies,
+    "swiftpm": swiftpm_dependencies,
+}
+
+
+def declares_any(names: set[str], candidates: list[str]) -> bool:
+    for candidate in candidates:
+        if candidate[-1] in "/.:":
+            if any(name.startswith(candidate) for name in names):
+                return True
+        elif candidate in names:
+            return True
+    return False
+
+
+def manifest_facts(kind: str, names: set[str]) -> dict[str, set[str]]:
+    facts = {}
+    for dimension, table in MANIFEST_SIGNALS[kind].items():
+        values = {value for value, candidates in table.items() if declares_any(names, candidates)}
+        if values:
+            facts[dimension] = values
+    return facts
+
+
+def resolve_manifests(parsed: list[tuple[str, dict]]) -> dict[str, tuple[str, list[str]]]:
+    runtimes = {value for _, facts in parsed for value in facts.get("runtime", ())}
+    runtime = next((value for value in MANIFEST_RUNTIME_PRIORITY if value in runtimes), None)
+    in_scope = [
+        (path, facts)
+        for path, facts in parsed
+        if runtime is None or not facts.get("runtime") or runtime in facts["runtime"]
+    ]
+    resolved = {}
+    for dimension in MANIFEST_DIMENSIONS:
+        if dimension == "runtime":
+            pool, values = parsed, {runtime} if runtime else set()
+        else:
+            pool = in_scope
+            values = {value for _, facts in pool for value in facts.get(dimension, ())}
+        if len(values) != 1:
+            continue
+        value = values.pop()
+        paths = sorted(path for path, facts in pool if value in facts.get(dimension, ()))
+        resolved[dimension] = (value, paths)
+    return resolved
+
+
+def parse_manifest_data(kind: str, data: bytes) -> dict[str, set[str]]:
+    return manifest_facts(kind, MANIFEST_PARSERS[kind](data.decode("utf-8", errors="ignore")))
+
+
+def parse_manifests(files: list[Path], max_bytes: int = DEFAULT_MAX_FILE_BYTES) -> list[tuple[str, dict]]:
+    parsed = []
+    for path in files:
+        kind = MANIFEST_KINDS.get(path.name.lower())
+        if kind is None:
+            continue
+        data, _ = read_source(path, max_bytes)
+        parsed.append((str(path), parse_manifest_data(kind, data)))
+    return parsed
+
+
+def manifest_summary(parsed: list[tuple[str, dict]]) -> dict:
+    return {
+        "files": [path for path, _ in parsed],
+        "resolved": resolve_manifests(parsed),
+        "full_scan": True,
+    }
+
+
+def new_file_ids() -> array:
+    return array("I")
+
+
+def evidence_paths(paths: list[str], file_ids, limit: int) -> list[str]:
+    return heapq.nsmallest(limit, (paths[file_id] for file_id in file_ids))
+
+
+def stack_choice(
+    rank: list[tuple[str, int, array]],
+    declared: Optional[tuple[str, list[str]]],
+    paths: list[str],
+) -> tuple[str, str, list[str]]:
+    if declared is not None:
+        return declared[0], "high", declared[1][:3]
+    if rank:
+        return rank[0][0], confidence_from_hits(rank[0][1]), evidence_paths(paths, rank[0][2], 3)
+    return "unknown", "low", []
 
 
 def detect_from_signals(
-    entries: list[tuple[Path, str]], signals: dict[str, list[str]]
-) -> list[tuple[str, int, list[str]]]:
+    matched_files: dict[str, array], signals: dict[str, list[str]], counts: dict[str, int]
+) -> list[tuple[str, int, array]]:
     results = []
-    for key, keys in signals.items():
-        matched_files = set()
-        for path, text in entries:
-            lowered = text.lower()
-            if any(term in lowered for term in keys):
-                matched_files.add(str(path))
-        count = len(matched_files)
-        if count > 0:
-            results.append((key, count, sorted(matched_files)))
+    for key in signals:
+        files = matched_files.get(key)
+        if files:
+            results.append((key, counts.get(key, len(files)), files))
     return sorted(results, key=lambda x: x[1], reverse=True)
 
 
@@ -194,20 +771,16 @@ def confidence_from_hits(hit_count: int) -> str:
     return "low"
 
 
-def infer_operations(all_text: str, evidence_map: dict[str, list[str]]) -> list[tuple[str, str]]:
-    lowered = all_text.lower()
-    present = []
-    for op, keywords in OPERATION_KEYWORDS.items():
-        hits = sum(lowered.count(keyword) for keyword in keywords)
-        if hits > 0:
-            present.append((op, hits))
+def infer_operations(
+    evidence_map: dict[str, array], counts: dict[str, int]
+) -> list[tuple[str, str]]:
     ordered = ["onboard_or_auth", "discover", "detail", "act", "verify", "manage"]
-    present_ops = {op for op, _ in present}
+    present_ops = {op for op, evidence in evidence_map.items() if evidence}
     results = []
     for op in ordered:
         if op in present_ops:
-            evidence = evidence_map.get(op, [])
-            results.append((op, confidence_from_hits(len(evidence))))
+            hits = counts.get(op, len(evidence_map[op]))
+            results.append((op, confidence_from_hits(hits)))
     return results
 
 
@@ -235,7 +808,7 @@ def op_rule(op: str) -> str:
     return rules.get(op, "Purpose first")
 
 
-def purpose_from_terms(term_counter: Counter) -> str:
+def purpose_from_terms(term_counter) -> str:
     domain_terms = [term for term, _ in term_counter.most_common(20) if len(term) > 3]
     if not domain_terms:
         return "The app exists to help users complete core mobile tasks efficiently."
@@ -243,62 +816,916 @@ def purpose_from_terms(term_counter: Counter) -> str:
     return f"The app likely exists to help users manage {top} through mobile flows."
 
 
-def build_report(repo: Path) -> str:
-    files = list(iter_source_files(repo))
-    entries: list[tuple[Path, str]] = []
-    combined_text_parts = []
-    routes = []
-    token_counter = Counter()
-    evidence_by_operation: dict[str, list[str]] = defaultdict(list)
-    route_files = set()
+def new_file_cost(read_seconds: float, size: int) -> dict:
+    cost = {phase: 0.0 for phase in FILE_PHASES}
+    cost["read"] = read_seconds
+    cost["bytes"] = size
+    cost["hits"] = 0
+    return cost
+
+
+def timed_read(path: Path, max_bytes: int) -> tuple[bytes, Optional[str], dict]:
+    started = time.perf_counter()
+    data, note = read_source(path, max_bytes)
+    return data, note, new_file_cost(time.perf_counter() - started, len(data))
+
+
+def timed_member_read(
+    handle, name: str, size: int, max_bytes: int
+) -> tuple[bytes, Optional[str], dict]:
+    started = time.perf_counter()
+    try:
+        if handle is None:
+            raise OSError("member cannot be opened")
+        data, note = sniff_and_slice(name, handle.read(max_bytes), size, max_bytes)
+    except (OSError, EOFError, zlib.error, tarfile.TarError, zipfile.BadZipFile):
+        data, note = b"", "skipped: unreadable"
+    return data, note, new_file_cost(time.perf_counter() - started, len(data))
+
+
+def scan_text(content: str, cost: Optional[dict] = None) -> dict:
+    clock = time.perf_counter
+    started = clock()
+    lowered = content.lower()
+    hits = SIGNAL_MATCHER.match(lowered)
+    matched = clock()
+    routes = collect_routes(content, lowered)
+    routed = clock()
+    tokens = Counter(TOKEN_PATTERN.findall(lowered))
+    tokenized = clock()
+    if cost is not None:
+        cost["signals"] = matched - started
+        cost["routes"] = routed - matched
+        cost["tokens"] = tokenized - routed
+        cost["hits"] = len(routes) + sum(len(keys) for keys in hits.values())
+    return {
+        "routes": routes,
+        "tokens": tokens,
+        "hits": {dimension: sorted(keys) for dimension, keys in hits.items()},
+    }
+
+
+def bytes_scannable(data: bytes) -> bool:
+    if any(sequence in data for sequence in SCAN_UNSAFE_ASCII):
+        return False
+    if data.isascii():
+        return True
+    if any(sequence in data for sequence in SCAN_UNSAFE_UTF8):
+        return False
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def scan_bytes(data: bytes, cost: Optional[dict] = None) -> dict:
+    clock = time.perf_counter
+    started = clock()
+    lowered = data.lower()
+    hits = SIGNAL_MATCHER.match(lowered)
+    matched = clock()
+    routes = collect_routes_bytes(data, lowered)
+    routed = clock()
+    tokens = Counter(TOKEN_PATTERN.findall(lowered.decode("utf-8")))
+    tokenized = clock()
+    if cost is not None:
+        cost["signals"] = matched - started
+        cost["routes"] = routed - matched
+        cost["tokens"] = tokenized - routed
+        cost["hits"] = len(routes) + sum(len(keys) for keys in hits.values())
+    return {
+        "routes": routes,
+        "tokens": tokens,
+        "hits": {dimension: sorted(keys) for dimension, keys in hits.items()},
+    }
+
+
+def scan_data(data: bytes, cost: Optional[dict] = None) -> Optional[dict]:
+    if bytes_scannable(data):
+        return scan_bytes(data, cost) if data else None
+    content = data.decode("utf-8", errors="ignore")
+    return scan_text(content, cost) if content else None
+
+
+def new_profile() -> dict:
+    return {"phases": {phase: [0.0, 0] for phase in PROFILE_PHASES}, "files": []}
+
+
+def record_file_cost(profile: dict, path: str, cost: dict) -> None:
+    for phase in FILE_PHASES:
+        profile["phases"][phase][0] += cost[phase]
+        profile["phases"][phase][1] += cost["bytes"]
+    seconds = sum(cost[phase] for phase in FILE_PHASES)
+    profile["files"].append((path, seconds, cost["bytes"], cost["hits"]))
+
+
+def new_scan_state(term_capacity: int = DEFAULT_TERM_CAPACITY, dedup: bool = True) -> dict:
+    return {
+        "scanned": 0,
+        "route_count": 0,
+        "route_index": {},
+        "paths": [],
+        "route_files": new_file_ids(),
+        "tokens": new_term_counter(term_capacity),
+        "signal_files": {dimension: defaultdict(new_file_ids) for dimension in SIGNAL_TABLES},
+        "signal_counts": {dimension: Counter() for dimension in SIGNAL_TABLES},
+        "blobs": {},
+        "dedup": {"files": 0, "bytes": 0} if dedup else None,
+        "walk": new_walk_stats(),
+        "cache": None,
+        "since": None,
+        "read_notes": [],
+        "profile": None,
+        "manifests": None,
+        "app": None,
+        "sample": None,
+    }
+
+
+def add_file_scan(
+    state: dict, path: str, scan: Optional[dict], digest: Optional[str] = None, size: int = 0
+) -> None:
+    counted = True
+    if state["dedup"] is not None and digest is not None:
+        blob = state["blobs"].get(digest)
+        if blob is not None:
+            scan = blob
+            counted = False
+            state["dedup"]["files"] += 1
+            state["dedup"]["bytes"] += size
+        elif scan is not None:
+            state["blobs"][digest] = {"routes": scan["routes"], "hits": scan["hits"]}
+    if scan is None:
+        return
+
+    state["scanned"] += 1
+    file_id = len(state["paths"])
+    state["paths"].append(path)
+    if scan["routes"]:
+        state["route_files"].append(file_id)
+        if counted:
+            state["route_count"] += len(scan["routes"])
+        for route, kind, line in scan["routes"]:
+            state["route_index"].setdefault(route, []).append((path, line, kind))
+    if counted:
+        state["tokens"].update(scan["tokens"])
+    for dimension, keys in scan["hits"].items():
+        for key in keys:
+            state["signal_files"][dimension][key].append(file_id)
+            if counted:
+                state["signal_counts"][dimension][key] += 1
+
+
+def add_scan_records(state: dict, records) -> None:
+    for path, digest, scan, note, size, cost in records:
+        name = str(path)
+        if note:
+            state["read_notes"].append((name, note))
+        add_file_scan(state, name, scan, digest, size)
+        if state["profile"] is not None and cost is not None:
+            record_file_cost(state["profile"], name, cost)
+
+
+def split_shards(items: list, count: int) -> list[list]:
+    count = max(1, count)
+    size = max(1, (len(items) + count - 1) // count)
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def iter_reads(paths: list[Path], max_bytes: int, read_threads: int = 0):
+    if read_threads <= 0:
+        for path in paths:
+            yield (path,) + timed_read(path, max_bytes)
+        return
+
+    in_flight: deque = deque()
+    with ThreadPoolExecutor(max_workers=read_threads) as pool:
+        for path in paths:
+            in_flight.append((path, pool.submit(timed_read, path, max_bytes)))
+            if len(in_flight) >= read_threads * READ_QUEUE_FACTOR:
+                done_path, future = in_flight.popleft()
+                yield (done_path,) + future.result()
+        while in_flight:
+            done_path, future = in_flight.popleft()
+            yield (done_path,) + future.result()
+
+
+def scan_read(
+    data: bytes, note: Optional[str], cost: dict, seen: Optional[set] = None
+) -> tuple[str, Optional[dict], Optional[str], dict]:
+    digest = hashlib.sha256(data).hexdigest()
+    if seen is not None:
+        if digest in seen:
+            return digest, None, note, cost
+        seen.add(digest)
+    return digest, scan_data(data, cost), note, cost
+
+
+def read_and_scan_files(
+    paths: list[Path],
+    max_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    dedup: bool = False,
+    read_threads: int = 0,
+) -> list[tuple[str, Optional[dict], Optional[str], dict]]:
+    seen: Optional[set] = set() if dedup else None
+    return [
+        scan_read(data, note, cost, seen)
+        for _, data, note, cost in iter_reads(paths, max_bytes, read_threads)
+    ]
+
+
+def shard_records(shard: list[Path], future):
+    for path, (digest, scan, note, cost) in zip(shard, future.result()):
+        yield path, digest, scan, note, cost["bytes"], cost
+
+
+def iter_scan_records(
+    files: list[Path], jobs: int, max_bytes: int, dedup: bool, read_threads: int = 0
+):
+    if jobs <= 1 or len(files) < 2:
+        seen: Optional[set] = set() if dedup else None
+        for path, data, note, cost in iter_reads(files, max_bytes, read_threads):
+            digest, scan, note, cost = scan_read(data, note, cost, seen)
+            yield path, digest, scan, note, cost["bytes"], cost
+        return
+
+    shards = split_shards(files, max(jobs * 4, -(-len(files) // MAX_SHARD_FILES)))
+    worker = partial(
+        read_and_scan_files, max_bytes=max_bytes, dedup=dedup, read_threads=read_threads
+    )
+    in_flight: deque = deque()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        try:
+            for shard in shards:
+                in_flight.append((shard, pool.submit(worker, shard)))
+                if len(in_flight) > jobs * SHARD_QUEUE_FACTOR:
+                    yield from shard_records(*in_flight.popleft())
+            while in_flight:
+                yield from shard_records(*in_flight.popleft())
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+
+def scanner_fingerprint(max_bytes: int = DEFAULT_MAX_FILE_BYTES) -> str:
+    digest = hashlib.sha256(f"{CACHE_VERSION}:{max_bytes}".encode("utf-8"))
+    digest.update(safe_read_bytes(Path(__file__)))
+    return digest.hexdigest()
+
+
+def scan_cache_path(cache_dir: Path, repo: Path) -> Path:
+    repo_key = hashlib.sha256(str(repo.resolve()).encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"scan-{repo_key}.json"
 
+
+def baseline_path(cache_dir: Path, repo: Path, commit: str) -> Path:
+    cache_path = scan_cache_path(cache_dir, repo)
+    return cache_path.with_name(f"{cache_path.stem}-baseline-{commit}.json")
+
+
+def load_scan_cache(cache_path: Path, fingerprint: str) -> dict:
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_scan_cache(cache_path: Path, fingerprint: str, entries: dict, max_bytes: int) -> int:
+    header = '{"version": %d, "fingerprint": %s, "entries": {' % (CACHE_VERSION, json.dumps(fingerprint))
+    size = len(header) + 2
+    parts = []
+    dropped = 0
+    for key in sorted(entries):
+        part = json.dumps(key) + ": " + json.dumps(entries[key], separators=(",", ":"))
+        if size + len(part) + 2 > max_bytes:
+            dropped += 1
+            continue
+        size += len(part) + 2
+        parts.append(part)
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    tmp_path.write_text(header + ", ".join(parts) + "}}", encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+    return dropped
+
+
+def cached_scan_records(
+    repo: Path,
+    files: list[Path],
+    jobs: int,
+    cache_dir: Path,
+    cache_max_bytes: int,
+    trusted: Optional[dict] = None,
+    save_baseline_as: Optional[Path] = None,
+    max_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    read_threads: int = 0,
+) -> tuple[list[tuple], dict]:
+    fingerprint = scanner_fingerprint(max_bytes)
+    cache_path = scan_cache_path(cache_dir, repo)
+    cached = load_scan_cache(cache_path, fingerprint)
+    trusted = trusted or {}
+    entries: dict[str, dict] = {}
+    stats = {"baseline": 0, "reused": 0, "rehashed": 0, "rescanned": 0, "evicted": 0}
+
+    keys = [os.path.relpath(path, repo).replace("\\", "/") for path in files]
+    stats_by_key: dict[str, os.stat_result] = {}
+    pending: list[int] = []
+    for index, (path, key) in enumerate(zip(files, keys)):
+        if key in trusted:
+            entries[key] = trusted[key]
+            stats["baseline"] += 1
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        stats_by_key[key] = stat
+        entry = cached.get(key)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            entries[key] = entry
+            stats["reused"] += 1
+        else:
+            pending.append(index)
+
+    pending_paths = [files[index] for index in pending]
+    if jobs <= 1 or len(pending_paths) < 2:
+        fresh = read_and_scan_files(pending_paths, max_bytes, read_threads=read_threads)
+    else:
+        fresh = []
+        worker = partial(read_and_scan_files, max_bytes=max_bytes, read_threads=read_threads)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for results in pool.map(worker, split_shards(pending_paths, jobs * 4)):
+                fresh.extend(results)
+
+    costs: dict[str, dict] = {}
+    for index, (digest, scan, note, cost) in zip(pending, fresh):
+        key = keys[index]
+        costs[key] = cost
+        stat = stats_by_key[key]
+        entry = cached.get(key)
+        if entry and entry.get("sha256") == digest:
+            scan = entry.get("scan")
+            stats["rehashed"] += 1
+        else:
+            stats["rescanned"] += 1
+        entries[key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+            "scan": scan,
+            "note": note,
+        }
+
+    records = []
+    for path, key in zip(files, keys):
+        entry = entries.get(key)
+        if entry:
+            size = entry.get("size", 0)
+            records.append((path, entry["sha256"], entry["scan"], entry.get("note"), size, costs.get(key)))
+
+    stats["evicted"] = len(set(cached) - set(entries))
+    stats["evicted"] += save_scan_cache(cache_path, fingerprint, entries, cache_max_bytes)
+    if save_baseline_as is not None:
+        save_scan_cache(save_baseline_as, fingerprint, entries, cache_max_bytes)
+    return records, stats
+
+
+def relative_parts(repo: Path, path: Path) -> tuple[str, ...]:
+    return path.relative_to(repo).parts
+
+
+def informative_order(repo: Path, files: list[Path]) -> list[Path]:
+    def rank(path: Path) -> int:
+        if path.name.lower() in MANIFEST_KINDS:
+            return 0
+        parts = {part.lower() for part in relative_parts(repo, path)[:-1]}
+        if parts & PRIORITY_DIR_HINTS:
+            return 1
+        if parts & APP_DIR_HINTS:
+            return 2
+        return 3
+
+    return sorted(files, key=rank)
+
+
+def confident_enough(state: dict) -> bool:
+    declared = state["manifests"]["resolved"] if state["manifests"] is not None else {}
+    for dimension in MANIFEST_DIMENSIONS:
+        if dimension in declared:
+            continue
+        if confidence_from_hits(max(state["signal_counts"][dimension].values(), default=0)) != "high":
+            return False
+    operations = infer_operations(state["signal_files"]["operations"], state["signal_counts"]["operations"])
+    return bool(operations) and all(confidence == "high" for _, confidence in operations)
+
+
+def iter_budgeted_records(state: dict, records, deadline: Optional[float], early_stop: bool):
+    sample = state["sample"]
+    try:
+        for record in records:
+            yield record
+            sample["files"] += 1
+            if sample["files"] == sample["total"]:
+                sample["stopped"] = None
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                sample["stopped"] = "time budget"
+                return
+            if early_stop and confident_enough(state):
+                sample["stopped"] = "confidence"
+                return
+    finally:
+        records.close()
+
+
+def scan_repo(
+    repo: Path,
+    jobs: int = 1,
+    cache_dir: Optional[Path] = None,
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024,
+    use_git: bool = False,
+    since: Optional[str] = None,
+    save_baseline: bool = False,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    term_capacity: int = DEFAULT_TERM_CAPACITY,
+    profile: bool = False,
+    dedup: bool = True,
+    read_threads: int = 0,
+    stack_only: bool = False,
+    max_seconds: float = 0.0,
+    max_files: int = 0,
+    early_stop: bool = False,
+) -> dict:
+    started = time.perf_counter()
+    if (since or save_baseline) and cache_dir is None:
+        raise ValueError("--since and --save-baseline need --cache-dir to store baselines")
+    budgeted = bool(max_seconds or max_files or early_stop)
+    if budgeted and cache_dir is not None:
+        raise ValueError("--max-seconds, --max-files and --early-stop cannot be combined with the scan cache")
+
+    use_git = use_git or bool(since) or save_baseline
+    trusted = None
+    since_info = None
+    if since:
+        commit = git_commit(repo, since)
+        if not commit:
+            raise ValueError(f"unknown git ref: {since}")
+        baseline = load_scan_cache(
+            baseline_path(cache_dir, repo, commit), scanner_fingerprint(max_file_bytes)
+        )
+        changed = git_changed_files(repo, commit)
+        trusted = {key: entry for key, entry in baseline.items() if key not in changed}
+        since_info = {"ref": since, "commit": commit, "baseline": bool(baseline), "changed": len(changed)}
+
+    save_baseline_as = None
+    if save_baseline:
+        if not git_worktree_clean(repo):
+            raise ValueError("--save-baseline needs a clean worktree so the baseline matches HEAD")
+        save_baseline_as = baseline_path(cache_dir, repo, git_commit(repo, "HEAD"))
+
+    walk_stats = new_walk_stats()
+    walk_started = time.perf_counter()
+    hinted, unhinted = list_source_files(repo, walk_stats, use_git)
+    files = hinted or unhinted
+    walk_seconds = time.perf_counter() - walk_started
+    state = new_scan_state(term_capacity, dedup)
+    if profile:
+        state["profile"] = new_profile()
+    manifests_started = time.perf_counter()
+    state["manifests"] = manifest_summary(parse_manifests(hinted + unhinted, max_file_bytes))
+    if profile:
+        state["profile"]["phases"]["manifests"][0] += time.perf_counter() - manifests_started
+    if stack_only and len(state["manifests"]["resolved"]) == len(MANIFEST_DIMENSIONS):
+        state["manifests"]["full_scan"] = False
+    elif cache_dir is not None:
+        records, state["cache"] = cached_scan_records(
+            repo,
+            files,
+            jobs,
+            cache_dir,
+            cache_max_bytes,
+            trusted,
+            save_baseline_as,
+            max_file_bytes,
+            read_threads,
+        )
+        add_scan_records(state, records)
+    elif budgeted:
+        ordered = informative_order(repo, files)
+        state["sample"] = {"total": len(ordered), "files": 0, "stopped": None}
+        if max_files and len(ordered) > max_files:
+            ordered = ordered[:max_files]
+            state["sample"]["stopped"] = "file budget"
+        records = iter_scan_records(ordered, jobs, max_file_bytes, dedup, read_threads)
+        deadline = started + max_seconds if max_seconds else None
+        add_scan_records(state, iter_budgeted_records(state, records, deadline, early_stop))
+    else:
+        add_scan_records(state, iter_scan_records(files, jobs, max_file_bytes, dedup, read_threads))
+    if profile:
+        state["profile"]["phases"]["walk"][0] += walk_seconds
+    state["walk"] = walk_stats
+    state["since"] = since_info
+    return state
+
+
+def is_archive(path: Path) -> bool:
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def iter_archive_members(archive: Path):
+    try:
+        if archive.name.lower().endswith(".zip"):
+            with zipfile.ZipFile(archive) as bundle:
+                for info in bundle.infolist():
+                    if info.is_dir():
+                        continue
+                    try:
+                        handle = bundle.open(info)
+                    except (RuntimeError, NotImplementedError):
+                        yield info.filename, info.file_size, None
+                        continue
+                    with handle:
+                        yield info.filename, info.file_size, handle
+        else:
+            with tarfile.open(archive, mode="r|*") as bundle:
+                for member in bundle:
+                    if member.isfile():
+                        yield member.name, member.size, bundle.extractfile(member)
+    except (OSError, EOFError, zlib.error, tarfile.TarError, zipfile.BadZipFile) as exc:
+        raise ValueError(f"cannot read archive {archive}: {exc}") from exc
+
+
+def scan_archive(
+    archive: Path,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    term_capacity: int = DEFAULT_TERM_CAPACITY,
+    profile: bool = False,
+    dedup: bool = True,
+) -> dict:
+    walk_stats = new_walk_stats()
+    walk_stats["source"] = "archive"
+    tiers = {
+        hinted: {
+            "members": [],
+            "blobs": {},
+            "seen": set() if dedup else None,
+            "tokens": new_term_counter(term_capacity),
+        }
+        for hinted in (True, False)
+    }
+    parsed = []
+    for member_name, size, handle in iter_archive_members(archive):
+        walk_stats["files_considered"] += 1
+        rel_parts = tuple(part for part in member_name.split("/") if part not in ("", ".", ".."))
+        if not rel_parts:
+            continue
+        lowered_parts = tuple(part.lower() for part in rel_parts)
+        if should_skip(lowered_parts) or not is_source_name(lowered_parts[-1]):
+            continue
+        path = str(archive.joinpath(*rel_parts))
+        data, note, cost = timed_member_read(handle, lowered_parts[-1], size, max_file_bytes)
+        kind = MANIFEST_KINDS.get(lowered_parts[-1])
+        if kind is not None:
+            parsed.append((path, parse_manifest_data(kind, data)))
+        tier = tiers[any(part in APP_DIR_HINTS for part in lowered_parts[:-1])]
+        digest, scan, note, cost = scan_read(data, note, cost, tier["seen"])
+        if scan is not None:
+            tier["tokens"].update(scan["tokens"])
+            tier["blobs"].setdefault(digest, {"routes": scan["routes"], "tokens": {}, "hits": scan["hits"]})
+        tier["members"].append((walk_order_key("/".join(rel_parts)), path, digest, note, cost))
+
+    walk_stats["hinted_files"] = len(tiers[True]["members"])
+    walk_stats["unhinted_files"] = len(tiers[False]["members"])
+    chosen = tiers[True] if tiers[True]["members"] else tiers[False]
+    tiers.clear()
+
+    state = new_scan_state(term_capacity, dedup)
+    if profile:
+        state["profile"] = new_profile()
+    state["manifests"] = manifest_summary(parsed)
+    blobs = chosen["blobs"]
+    add_scan_records(
+        state,
+        (
+            (path, digest, blobs.get(digest), note, cost["bytes"], cost)
+            for _, path, digest, note, cost in sorted(chosen["members"], key=lambda member: member[0])
+        ),
+    )
+    state["tokens"] = chosen["tokens"]
+    state["walk"] = walk_stats
+    return state
+
+
+def build_report(repo: Path, **options) -> str:
+    return render_report(scan_repo(repo, **options))
+
+
+def app_root_name(root: tuple[str, ...]) -> str:
+    return "/".join(root) if root else "."
+
+
+def app_report_name(root: tuple[str, ...]) -> str:
+    return ("-".join(root) if root else "root") + ".md"
+
+
+def outermost_roots(candidates: set[tuple[str, ...]]) -> list[tuple[str, ...]]:
+    roots: list[tuple[str, ...]] = []
+    for candidate in sorted(candidates, key=lambda parts: (len(parts), parts)):
+        if not any(candidate[: len(root)] == root for root in roots):
+            roots.append(candidate)
+    return sorted(roots)
+
+
+def detect_app_roots(
+    repo: Path, files: list[Path], parsed: list[tuple[str, dict]], app_globs: list[str]
+) -> list[tuple[str, ...]]:
+    if app_globs:
+        patterns = [pattern.strip("/") for pattern in app_globs]
+        directories = {
+            parts[:depth]
+            for parts in (relative_parts(repo, path) for path in files)
+            for depth in range(1, len(parts))
+        }
+        matched = {
+            directory
+            for directory in directories
+            if any(fnmatch.fnmatchcase("/".join(directory), pattern) for pattern in patterns)
+        }
+        if not matched:
+            raise ValueError("no directories matched --app-glob")
+        return outermost_roots(matched)
+
+    candidates = {
+        relative_parts(repo, Path(path))[:-1] for path, facts in parsed if facts.get("runtime")
+    }
+    if any(candidate and candidate[0].lower() not in APP_HOST_DIRS for candidate in candidates):
+        candidates.discard(())
+    return outermost_roots(candidates) or [()]
+
+
+def assign_app_files(
+    repo: Path, roots: list[tuple[str, ...]], files: list[Path]
+) -> tuple[dict, int]:
+    members = {root: ([], []) for root in roots}
+    unassigned = 0
     for path in files:
-        content = safe_read(path)
-        if not content:
+        parts = relative_parts(repo, path)
+        root = next((parts[:depth] for depth in range(len(parts)) if parts[:depth] in members), None)
+        if root is None:
+            unassigned += 1
             continue
+        hinted = any(part.lower() in APP_DIR_HINTS for part in parts[len(root) : -1])
+        members[root][0 if hinted else 1].append(path)
+    return members, unassigned
 
-        entries.append((path, content))
-        combined_text_parts.append(content)
 
-        found_routes = collect_routes(content)
-        if found_routes:
-            route_files.add(str(path))
-            routes.extend(found_routes)
+def scan_app(
+    app: dict,
+    max_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    term_capacity: int = DEFAULT_TERM_CAPACITY,
+    dedup: bool = True,
+    read_threads: int = 0,
+    stack_only: bool = False,
+) -> tuple[dict, str]:
+    state = new_scan_state(term_capacity, dedup)
+    state["walk"] = app["walk"]
+    state["app"] = {"root": app["root"], "apps": app["apps"]}
+    state["manifests"] = manifest_summary(app["manifests"])
+    if stack_only and len(state["manifests"]["resolved"]) == len(MANIFEST_DIMENSIONS):
+        state["manifests"]["full_scan"] = False
+    else:
+        add_scan_records(state, iter_scan_records(app["files"], 1, max_bytes, dedup, read_threads))
 
-        lowered = content.lower()
-        words = re.findall(r"[a-z][a-z0-9_-]{2,}", lowered)
-        token_counter.update(words)
+    stack = infer_stack(state)
+    summary = {
+        "root": app["root"],
+        "report": app["report"],
+        "files": len(app["files"]),
+        "scanned": state["scanned"],
+        "operations": len(stack["operations"]),
+    }
+    for dimension in MANIFEST_DIMENSIONS:
+        summary[dimension] = stack[dimension][:2]
+    return summary, render_report(state)
 
-        for op, keywords in OPERATION_KEYWORDS.items():
-            if any(keyword in lowered for keyword in keywords):
-                evidence_by_operation[op].append(str(path))
 
-    all_text = "\n".join(combined_text_parts)
-    runtime_rank = detect_from_signals(entries, RUNTIME_SIGNALS)
-    design_rank = detect_from_signals(entries, DESIGN_SYSTEM_SIGNALS)
-    library_rank = detect_from_signals(entries, UI_LIBRARY_SIGNALS)
-    op_sequence = infer_operations(all_text, evidence_by_operation)
+def scan_apps(
+    repo: Path,
+    jobs: int = 1,
+    use_git: bool = False,
+    app_globs: Optional[list[str]] = None,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    term_capacity: int = DEFAULT_TERM_CAPACITY,
+    dedup: bool = True,
+    read_threads: int = 0,
+    stack_only: bool = False,
+) -> dict:
+    walk_stats = new_walk_stats()
+    hinted, unhinted = list_source_files(repo, walk_stats, use_git)
+    files = sorted(
+        hinted + unhinted, key=lambda path: walk_order_key("/".join(relative_parts(repo, path)))
+    )
+    parsed = parse_manifests(files, max_file_bytes)
+    roots = detect_app_roots(repo, files, parsed, app_globs or [])
+    members, unassigned = assign_app_files(repo, roots, files)
 
-    runtime = runtime_rank[0][0] if runtime_rank else "unknown"
-    design_system = design_rank[0][0] if design_rank else "unknown"
-    library = library_rank[0][0] if library_rank else "unknown"
+    apps = []
+    for root in roots:
+        app_hinted, app_unhinted = members[root]
+        walk = dict(walk_stats, hinted_files=len(app_hinted), unhinted_files=len(app_unhinted))
+        apps.append(
+            {
+                "root": app_root_name(root),
+                "report": app_report_name(root),
+                "apps": len(roots),
+                "files": app_hinted or app_unhinted,
+                "manifests": [
+                    (path, facts)
+                    for path, facts in parsed
+                    if relative_parts(repo, Path(path))[: len(root)] == root
+                ],
+                "walk": walk,
+            }
+        )
 
-    runtime_conf = confidence_from_hits(runtime_rank[0][1]) if runtime_rank else "low"
-    design_conf = confidence_from_hits(design_rank[0][1]) if design_rank else "low"
-    library_conf = confidence_from_hits(library_rank[0][1]) if library_rank else "low"
+    worker = partial(
+        scan_app,
+        max_bytes=max_file_bytes,
+        term_capacity=term_capacity,
+        dedup=dedup,
+        read_threads=read_threads,
+        stack_only=stack_only,
+    )
+    if jobs > 1 and len(apps) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(apps))) as pool:
+            results = list(pool.map(worker, apps))
+    else:
+        results = [worker(app) for app in apps]
+    return {
+        "repo": str(repo),
+        "detection": "--app-glob" if app_globs else "manifests",
+        "apps": results,
+        "unassigned": unassigned,
+        "walk": walk_stats,
+    }
 
-    purpose = purpose_from_terms(token_counter)
-    purpose_conf = confidence_from_hits(len(routes) + len(op_sequence))
 
-    route_preview = sorted(set(routes))[:12]
-    route_evidence_preview = sorted(route_files)[:6]
-    runtime_evidence_preview = runtime_rank[0][2][:3] if runtime_rank else []
-    design_evidence_preview = design_rank[0][2][:3] if design_rank else []
-    library_evidence_preview = library_rank[0][2][:3] if library_rank else []
+def render_app_index(result: dict) -> str:
+    lines = []
+    lines.append("# App Intent Index")
+    lines.append("")
+    lines.append(f"- Repository: {result['repo']}")
+    lines.append(f"- App roots: {len(result['apps'])} (detected from {result['detection']})")
+    lines.append(
+        f"- Shared walk: {result['walk']['files_considered']} files considered, "
+        f"{result['unassigned']} source files outside app roots were not scanned"
+    )
+    lines.append("")
+    lines.append("| App root | Files | Runtime | Design system | UI library | Operations | Report |")
+    lines.append("|---|---|---|---|---|---|---|")
+    for summary, _ in result["apps"]:
+        stack = [f"{value} ({conf})" for value, conf in (summary[key] for key in MANIFEST_DIMENSIONS)]
+        lines.append(
+            f"| {summary['root']} | {summary['files']} | {' | '.join(stack)} | "
+            f"{summary['operations']} | {summary['report']} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def route_index_document(state: dict) -> dict:
+    routes = []
+    for route in sorted(state["route_index"]):
+        locations = sorted(set(state["route_index"][route]))
+        routes.append(
+            {
+                "route": route,
+                "occurrences": len(state["route_index"][route]),
+                "locations": [
+                    {"file": path, "line": line, "pattern": kind} for path, line, kind in locations
+                ],
+            }
+        )
+    return {"declarations": state["route_count"], "distinct_routes": len(routes), "routes": routes}
+
+
+def profile_directories(files: list, root: Optional[str] = None) -> dict[str, list]:
+    directories: dict[str, list] = defaultdict(lambda: [0.0, 0, 0, 0])
+    if not files:
+        return directories
+    if root:
+        root = os.path.normpath(root)
+    else:
+        root = os.path.commonpath([os.path.dirname(path) for path, _, _, _ in files])
+    for path, seconds, size, hits in files:
+        directory = os.path.dirname(path)
+        while True:
+            totals = directories[directory]
+            totals[0] += seconds
+            totals[1] += size
+            totals[2] += 1
+            totals[3] += hits
+            parent = os.path.dirname(directory)
+            if directory == root or parent == directory or not directory.startswith(root):
+                break
+            directory = parent
+    return directories
+
+
+def render_profile(
+    profile: dict, wall_seconds: float, top: int = DEFAULT_PROFILE_TOP, root: Optional[str] = None
+) -> str:
+    lines = []
+    lines.append("## Scan Profile")
+    lines.append("")
+    lines.append(f"- Wall time: {wall_seconds:.3f}s (phase times are summed across workers)")
+    lines.append("")
+    lines.append("| Phase | Seconds | Bytes |")
+    lines.append("|---|---|---|")
+    for phase in PROFILE_PHASES:
+        seconds, size = profile["phases"][phase]
+        lines.append(f"| {phase} | {seconds:.3f} | {size} |")
+
+    files = profile["files"]
+    lines.append("")
+    lines.append(f"### Slowest Files (top {top})")
+    lines.append("")
+    for path, seconds, size, hits in heapq.nlargest(top, files, key=lambda item: item[1]):
+        lines.append(f"- {path}: {seconds:.4f}s, {size} bytes, {hits} hits")
+    if not files:
+        lines.append("- None (no files were read in this run)")
+
+    directories = profile_directories(files, root)
+    lines.append("")
+    lines.append(f"### Slowest Directories (top {top}, including subdirectories)")
+    lines.append("")
+    for directory, (seconds, size, count, hits) in heapq.nlargest(
+        top, directories.items(), key=lambda item: item[1][0]
+    ):
+        lines.append(f"- {directory}: {seconds:.4f}s, {size} bytes, {count} files, {hits} hits")
+    if not directories:
+        lines.append("- None (no files were read in this run)")
+    return "\n".join(lines) + "\n"
+
+
+def infer_stack(state: dict) -> dict:
+    manifests = state["manifests"]
+    declared = manifests["resolved"] if manifests is not None else {}
+    stack = {}
+    for dimension in MANIFEST_DIMENSIONS:
+        rank = detect_from_signals(
+            state["signal_files"][dimension],
+            SIGNAL_TABLES[dimension],
+            state["signal_counts"][dimension],
+        )
+        stack[dimension] = stack_choice(rank, declared.get(dimension), state["paths"])
+    stack["operations"] = infer_operations(
+        state["signal_files"]["operations"], state["signal_counts"]["operations"]
+    )
+    return stack
+
+
+def render_report(state: dict) -> str:
+    evidence_by_operation = state["signal_files"]["operations"]
+    manifests = state["manifests"]
+    declared = manifests["resolved"] if manifests is not None else {}
+    full_scan = manifests is None or manifests["full_scan"]
+
+    stack = infer_stack(state)
+    runtime, runtime_conf, runtime_evidence_preview = stack["runtime"]
+    design_system, design_conf, design_evidence_preview = stack["design_system"]
+    library, library_conf, library_evidence_preview = stack["ui_library"]
+    op_sequence = stack["operations"]
+
+    purpose = purpose_from_terms(state["tokens"])
+    purpose_conf = confidence_from_hits(state["route_count"] + len(op_sequence))
+
+    route_index = state["route_index"]
+    route_preview = [
+        f"{route} ({route_index[route][0][0]}:{route_index[route][0][1]})"
+        for route in sorted(route_index)[:ROUTE_SAMPLES]
+    ]
+    route_evidence_preview = evidence_paths(state["paths"], state["route_files"], 6)
+
+    sample = state["sample"]
+    coverage = sample["files"] / sample["total"] if sample and sample["total"] else 1.0
+    sampled = sample is not None and sample["stopped"] is not None
 
     lines = []
     lines.append("# App Intent Inference")
     lines.append("")
+    if sampled:
+        lines.append(
+            f"> Sampled inference: {sample['files']} of {sample['total']} source files read "
+            f"(coverage {coverage:.1%}), stopped by {SAMPLE_STOP_REASONS[sample['stopped']]}. "
+            "Confidence reflects the sample only."
+        )
+        lines.append("")
     lines.append("## Runtime Detection")
     lines.append("")
     lines.append(f"- Platform/runtime: {runtime}")
@@ -333,11 +1760,14 @@ def build_report(repo: Path) -> str:
         lines.append("1. Operation: Unknown (insufficient evidence)")
         lines.append("   - User intent: Unknown")
         lines.append("   - UX sequencing rule: Purpose first")
-        lines.append("   - Evidence: No strong operation keywords found")
+        if full_scan:
+            lines.append("   - Evidence: No strong operation keywords found")
+        else:
+            lines.append("   - Evidence: Full-text scan skipped (--stack-only)")
         lines.append("   - Confidence: low")
     else:
         for idx, (op, conf) in enumerate(op_sequence, start=1):
-            evidence = sorted(set(evidence_by_operation.get(op, [])))[:3]
+            evidence = evidence_paths(state["paths"], evidence_by_operation.get(op, ()), 3)
             evidence_text = ", ".join(evidence) if evidence else "No direct file evidence"
             lines.append(f"{idx}. Operation: {op_label(op)}")
             lines.append("   - User intent: Complete this stage with minimal friction")
@@ -347,48 +1777,623 @@ def build_report(repo: Path) -> str:
     lines.append("")
     lines.append("## Supporting Evidence")
     lines.append("")
-    lines.append(f"- Scanned source files: {len(entries)}")
+    app = state["app"]
+    if app is not None:
+        lines.append(f"- App root: {app['root']} (one of {app['apps']} app roots from a shared walk)")
+    lines.append(f"- Scanned source files: {state['scanned']}")
+    if sample is not None:
+        lines.append(
+            f"- Sampling: informative-first order, {sample['files']} of {sample['total']} files read, "
+            f"coverage {coverage:.3f}"
+        )
+    if manifests is not None and manifests["files"]:
+        lines.append(
+            f"- Manifests: {len(manifests['files'])} parsed; declared dependencies resolved "
+            + (", ".join(declared) if declared else "nothing, stack inferred from the full-text scan")
+        )
+    if not full_scan:
+        lines.append("- Full-text scan: skipped, manifests resolved runtime, design system and UI library")
+    walk = state["walk"]
+    if walk["source"] == "git":
+        lines.append(
+            f"- File listing: git index, {walk['files_considered']} files considered, "
+            f"{walk['hinted_files']} in app directories, {walk['unhinted_files']} elsewhere"
+        )
+    elif walk["source"] == "archive":
+        lines.append(
+            f"- Archive listing: {walk['files_considered']} members considered, "
+            f"{walk['hinted_files']} in app directories, {walk['unhinted_files']} elsewhere"
+        )
+    else:
+        lines.append(
+            f"- Directory walk: {walk['dirs_visited']} directories visited, "
+            f"{walk['dirs_pruned']} pruned, {walk['files_considered']} files considered, "
+            f"{walk['hinted_files']} in app directories, {walk['unhinted_files']} elsewhere"
+        )
+    dedup = state["dedup"]
+    if dedup is not None and dedup["files"]:
+        lines.append(
+            f"- Duplicate content: {dedup['files']} files ({dedup['bytes']} bytes) reused the scan "
+            "of an identical file; evidence lists every path, hit counts use unique content"
+        )
+    since = state["since"]
+    if since is not None:
+        if since["baseline"]:
+            lines.append(
+                f"- Changed since {since['ref']} ({since['commit'][:12]}): "
+                f"{since['changed']} files changed; unchanged files merged from the stored baseline"
+            )
+        else:
+            lines.append(
+                f"- Changed since {since['ref']} ({since['commit'][:12]}): "
+                "no stored baseline for this commit, all files validated through the scan cache"
+            )
+    cache = state["cache"]
+    if cache is not None:
+        lines.append(
+            f"- Scan cache: {cache['baseline']} from baseline, {cache['reused']} reused, "
+            f"{cache['rehashed']} unchanged after rehash, {cache['rescanned']} rescanned, "
+            f"{cache['evicted']} evicted"
+        )
     lines.append(
         "- Route samples: "
         + (", ".join(route_preview) if route_preview else "No route patterns detected")
     )
+    lines.append(
+        f"- Route index: {len(route_index)} distinct routes from {state['route_count']} declarations"
+    )
     lines.append(
         "- Route evidence files: "
         + (", ".join(route_evidence_preview) if route_evidence_preview else "No route files detected")
     )
+    read_notes = state["read_notes"]
+    if read_notes:
+        lines.append("")
+        lines.append("## Skipped And Truncated Files")
+        lines.append("")
+        for path, note in read_notes[:READ_NOTES_PREVIEW]:
+            lines.append(f"- {path}: {note}")
+        if len(read_notes) > READ_NOTES_PREVIEW:
+            lines.append(f"- ... and {len(read_notes) - READ_NOTES_PREVIEW} more")
     lines.append("")
     lines.append("## Gaps And Unknowns")
     lines.append("")
-    if runtime == "unknown":
+    if not full_scan:
+        lines.append("- Purpose and user operations were not inferred; rerun without --stack-only.")
+    elif runtime == "unknown":
         lines.append("- Runtime could not be inferred confidently from static code signals.")
-    if not op_sequence:
+    if full_scan and not op_sequence:
         lines.append("- Core user operation sequence is incomplete; inspect navigation and API layers manually.")
-    if purpose_conf == "low":
+    if full_scan and purpose_conf == "low":
         lines.append("- Purpose inference is low confidence; add product copy or route naming clarity.")
+    if sampled:
+        lines.append(f"- Report is sampled at {coverage:.1%} coverage; rerun without budgets for a full scan.")
     if runtime != "unknown" and op_sequence and purpose_conf != "low":
         lines.append("- No major inference blockers detected from static analysis.")
 
     return "\n".join(lines) + "\n"
 
 
+def open_inotify() -> Optional[dict]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    return {"libc": libc, "fd": fd}
+
+
+def add_inotify_watches(watcher: dict, directories: list[str]) -> bool:
+    for directory in directories:
+        if watcher["libc"].inotify_add_watch(watcher["fd"], os.fsencode(directory), INOTIFY_MASK) < 0:
+            if ctypes.get_errno() not in (errno.ENOENT, errno.ENOTDIR):
+                return False
+    return True
+
+
+def wait_for_events(fd: int, timeout: Optional[float]) -> bool:
+    readable, _, _ = select.select([fd], [], [], timeout)
+    if not readable:
+        return False
+    try:
+        while os.read(fd, 65536):
+            pass
+    except BlockingIOError:
+        pass
+    return True
+
+
+def file_signature(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def watched_directories(repo: Path, files: list[Path]) -> list[str]:
+    directories = {str(repo)}
+    for path in files:
+        parent = path.parent
+        while len(parent.parts) > len(repo.parts) and str(parent) not in directories:
+            directories.add(str(parent))
+            parent = parent.parent
+    return sorted(directories)
+
+
+def new_watch_session(repo: Path, **options) -> dict:
+    return {
+        "repo": repo,
+        "options": options,
+        "files": [],
+        "listed": [],
+        "signatures": {},
+        "records": {},
+        "blobs": {},
+        "manifests": [],
+        "walk": new_walk_stats(),
+    }
+
+
+def refresh_watch_session(session: dict, jobs: int = 1) -> tuple[int, int, bool]:
+    options = session["options"]
+    walk_stats = new_walk_stats()
+    hinted, unhinted = list_source_files(session["repo"], walk_stats, options["use_git"])
+    files = hinted or unhinted
+    listed = hinted + unhinted
+    signatures = {str(path): file_signature(path) for path in listed}
+    previous = session["signatures"]
+    records = session["records"]
+    changed = [
+        path
+        for path in files
+        if str(path) not in records or previous.get(str(path)) != signatures[str(path)]
+    ]
+    live = {str(path) for path in files}
+    removed = [key for key in records if key not in live]
+    manifests_changed = any(
+        previous.get(str(path)) != signatures[str(path)]
+        for path in listed
+        if path.name.lower() in MANIFEST_KINDS
+    ) or previous.keys() != signatures.keys()
+
+    blobs = session["blobs"]
+    for path, digest, scan, note, size, _ in iter_scan_records(
+        changed, jobs, options["max_file_bytes"], True, options["read_threads"]
+    ):
+        if scan is not None:
+            blobs.setdefault(digest, scan)
+        records[str(path)] = (digest, note, size)
+    for key in removed:
+        del records[key]
+    referenced = {digest for digest, _, _ in records.values()}
+    for digest in [digest for digest in blobs if digest not in referenced]:
+        del blobs[digest]
+
+    dirty = bool(manifests_changed or changed or removed)
+    if dirty:
+        session["manifests"] = parse_manifests(listed, options["max_file_bytes"])
+    session["files"] = files
+    session["listed"] = listed
+    session["signatures"] = signatures
+    session["walk"] = walk_stats
+    return len(changed), len(removed), dirty
+
+
+def watch_state(session: dict) -> dict:
+    options = session["options"]
+    state = new_scan_state(options["term_capacity"], options["dedup"])
+    state["walk"] = session["walk"]
+    state["manifests"] = manifest_summary(session["manifests"])
+    records = session["records"]
+    blobs = session["blobs"]
+    add_scan_records(
+        state,
+        (
+            (path, records[str(path)][0], blobs.get(records[str(path)][0]))
+            + records[str(path)][1:]
+            + (None,)
+            for path in session["files"]
+        ),
+    )
+    return state
+
+
+def watch_repo(
+    repo: Path,
+    emit,
+    jobs: int = 1,
+    debounce_seconds: float = WATCH_DEBOUNCE_MS / 1000.0,
+    poll_seconds: float = WATCH_POLL_SECONDS,
+    **options,
+) -> None:
+    session = new_watch_session(repo, **options)
+    started = time.perf_counter()
+    changed, _, _ = refresh_watch_session(session, jobs)
+    emit(watch_state(session))
+    watcher = open_inotify()
+    if watcher is not None and not add_inotify_watches(
+        watcher, watched_directories(repo, session["listed"])
+    ):
+        os.close(watcher["fd"])
+        watcher = None
+    print(
+        f"Watch: scanned {changed} files in {(time.perf_counter() - started) * 1000:.1f} ms; "
+        f"watching with {'inotify' if watcher is not None else 'polling'}",
+        file=sys.stderr,
+    )
+
+    try:
+        while True:
+            if watcher is not None:
+                wait_for_events(watcher["fd"], None)
+                while wait_for_events(watcher["fd"], debounce_seconds):
+                    pass
+            else:
+                time.sleep(poll_seconds)
+            started = time.perf_counter()
+            changed, removed, dirty = refresh_watch_session(session, jobs)
+            if not dirty:
+                continue
+            if watcher is not None:
+                add_inotify_watches(watcher, watched_directories(repo, session["listed"]))
+            emit(watch_state(session))
+            print(
+                f"Watch: rescanned {changed} changed and dropped {removed} removed files in "
+                f"{(time.perf_counter() - started) * 1000:.1f} ms",
+                file=sys.stderr,
+            )
+    finally:
+        if watcher is not None:
+            os.close(watcher["fd"])
+
+
+def write_outputs(state: dict, report: str, output: Optional[Path], routes_json: Optional[Path]) -> None:
+    if routes_json is not None:
+        routes_json.write_text(json.dumps(route_index_document(state), indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote route index: {routes_json}")
+    if output is not None:
+        output.write_text(report, encoding="utf-8")
+        print(f"Wrote report: {output}")
+    else:
+        print(report)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Infer app intent from codebase.")
-    parser.add_argument("repo_path", help="Path to repository root")
+    parser.add_argument("repo_path", help="Path to repository root, or a .zip, .tar, .tar.gz or .tgz archive of one")
     parser.add_argument("--output", help="Optional output markdown path")
+    parser.add_argument(
+        "--artifact-dir",
+        help=f"Write the report as {ARTIFACT_REPORT_NAME} into this run-artifacts/<run-id> folder",
+    )
+    parser.add_argument("--routes-json", help="Optional output path for the structured route index")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for scanning files (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--read-threads",
+        type=int,
+        default=0,
+        help="Threads prefetching file reads ahead of scanning, for slow or network mounts (0 = off)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for the incremental per-file scan cache (for example <repo>/.intent-cache)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_CACHE_MAX_MB,
+        help="Size cap for the scan cache file in megabytes",
+    )
+    parser.add_argument(
+        "--max-file-bytes",
+        type=int,
+        default=DEFAULT_MAX_FILE_BYTES,
+        help="Per-file read budget in bytes; larger files are truncated and reported",
+    )
+    parser.add_argument(
+        "--term-capacity",
+        type=int,
+        default=DEFAULT_TERM_CAPACITY,
+        help="Distinct terms kept by the bounded purpose-term counter (0 = exact counting)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-phase and per-file scan costs to stderr",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_PROFILE_TOP,
+        help="Number of slowest files and directories listed by --profile",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Scan and count byte-identical files separately instead of once per content hash",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=0.0,
+        help="Stop reading files after this many seconds and report a sample (0 = no limit)",
+    )
+    parser.add_argument(
+        "--max-files",
+        type=int,
+        default=0,
+        help="Read at most this many source files, most informative first (0 = no limit)",
+    )
+    parser.add_argument(
+        "--early-stop",
+        action="store_true",
+        help="Stop once runtime, design system, UI library and operations all reach high confidence",
+    )
+    parser.add_argument(
+        "--stack-only",
+        action="store_true",
+        help="Skip the full-text scan when manifests resolve runtime, design system and UI library",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep per-file scans in memory and re-emit the report when files change",
+    )
+    parser.add_argument(
+        "--debounce-ms",
+        type=int,
+        default=WATCH_DEBOUNCE_MS,
+        help="Quiet period after the last change before --watch rescans",
+    )
+    parser.add_argument(
+        "--poll-seconds",
+        type=float,
+        default=WATCH_POLL_SECONDS,
+        help="Polling interval for --watch when inotify is unavailable",
+    )
+    parser.add_argument(
+        "--apps",
+        action="store_true",
+        help="Monorepo mode: detect app roots from manifests and write one report per app",
+    )
+    parser.add_argument(
+        "--app-glob",
+        action="append",
+        default=[],
+        help="Directory glob relative to the repo that marks an app root (repeatable, implies --apps)",
+    )
+    parser.add_argument(
+        "--apps-dir",
+        help="Directory for per-app reports and index.md in --apps mode (default: print to stdout)",
+    )
+    parser.add_argument(
+        "--git",
+        action="store_true",
+        help="List files from the local git index instead of walking the filesystem",
+    )
+    parser.add_argument(
+        "--since",
+        help="Rescan only files changed relative to this git ref and merge the stored baseline",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store this run as the baseline for HEAD (clean worktree and --cache-dir required)",
+    )
     args = parser.parse_args()
 
     repo = Path(args.repo_path)
-    if not repo.exists() or not repo.is_dir():
+    archive = repo.is_file() and is_archive(repo)
+    if not archive and (not repo.exists() or not repo.is_dir()):
         print(f"ERROR: repo path is invalid: {repo}")
         return 2
+    if args.jobs < 0:
+        print("ERROR: --jobs must be 0 or a positive integer")
+        return 2
+    if args.read_threads < 0:
+        print("ERROR: --read-threads must be 0 or a positive integer")
+        return 2
+    if args.cache_max_mb <= 0:
+        print("ERROR: --cache-max-mb must be a positive integer")
+        return 2
+    if args.max_file_bytes <= 0:
+        print("ERROR: --max-file-bytes must be a positive integer")
+        return 2
+    if args.profile_top <= 0:
+        print("ERROR: --profile-top must be a positive integer")
+        return 2
+    if args.term_capacity < 0:
+        print("ERROR: --term-capacity must be 0 or a positive integer")
+        return 2
+    if args.max_seconds < 0:
+        print("ERROR: --max-seconds must be 0 or a positive number")
+        return 2
+    if args.max_files < 0:
+        print("ERROR: --max-files must be 0 or a positive integer")
+        return 2
+    if args.debounce_ms < 0:
+        print("ERROR: --debounce-ms must be 0 or a positive integer")
+        return 2
+    if args.poll_seconds <= 0:
+        print("ERROR: --poll-seconds must be a positive number")
+        return 2
 
-    report = build_report(repo)
-    if args.output:
-        out_path = Path(args.output)
-        out_path.write_text(report, encoding="utf-8")
-        print(f"Wrote report: {out_path}")
-    else:
-        print(report)
+    if archive:
+        archive_conflicts = [
+            args.apps,
+            args.app_glob,
+            args.apps_dir,
+            args.watch,
+            args.git,
+            args.cache_dir,
+            args.since,
+            args.save_baseline,
+            args.stack_only,
+            args.max_seconds,
+            args.max_files,
+            args.early_stop,
+            args.read_threads,
+            args.jobs != 1,
+        ]
+        if any(archive_conflicts):
+            print(
+                "ERROR: archive input is scanned as one stream and only supports --output, "
+                "--artifact-dir, --routes-json, --max-file-bytes, --term-capacity, --profile and --no-dedup"
+            )
+            return 2
+
+    jobs = args.jobs or os.cpu_count() or 1
+    if args.apps or args.app_glob:
+        per_repo_options = [
+            args.output,
+            args.artifact_dir,
+            args.routes_json,
+            args.cache_dir,
+            args.since,
+            args.save_baseline,
+            args.profile,
+            args.watch,
+            args.max_seconds,
+            args.max_files,
+            args.early_stop,
+        ]
+        if any(per_repo_options):
+            print(
+                "ERROR: --apps cannot be combined with --output, --artifact-dir, --routes-json, "
+                "--cache-dir, --since, --save-baseline, --profile, --watch or scan budgets; "
+                "use --apps-dir for output"
+            )
+            return 2
+        try:
+            result = scan_apps(
+                repo,
+                jobs=jobs,
+                use_git=args.git,
+                app_globs=args.app_glob,
+                max_file_bytes=args.max_file_bytes,
+                term_capacity=args.term_capacity,
+                dedup=not args.no_dedup,
+                read_threads=args.read_threads,
+                stack_only=args.stack_only,
+            )
+        except ValueError as exc:
+            print(f"ERROR: {exc}")
+            return 2
+        index = render_app_index(result)
+        if args.apps_dir:
+            apps_dir = Path(args.apps_dir)
+            apps_dir.mkdir(parents=True, exist_ok=True)
+            for summary, report in result["apps"]:
+                (apps_dir / summary["report"]).write_text(report, encoding="utf-8")
+            (apps_dir / "index.md").write_text(index, encoding="utf-8")
+            print(f"Wrote {len(result['apps'])} app reports and index: {apps_dir}")
+        else:
+            print(index)
+            for _, report in result["apps"]:
+                print(report)
+        return 0
+    if args.apps_dir:
+        print("ERROR: --apps-dir needs --apps or --app-glob")
+        return 2
+
+    if args.output and args.artifact_dir:
+        print("ERROR: use either --output or --artifact-dir")
+        return 2
+    output = Path(args.output) if args.output else None
+    if args.artifact_dir:
+        output = Path(args.artifact_dir) / ARTIFACT_REPORT_NAME
+    routes_json = Path(args.routes_json) if args.routes_json else None
+
+    if args.watch:
+        watch_conflicts = [
+            args.cache_dir,
+            args.since,
+            args.save_baseline,
+            args.profile,
+            args.stack_only,
+            args.max_seconds,
+            args.max_files,
+            args.early_stop,
+        ]
+        if any(watch_conflicts):
+            print(
+                "ERROR: --watch keeps scans in memory and cannot be combined with --cache-dir, "
+                "--since, --save-baseline, --profile, --stack-only or scan budgets"
+            )
+            return 2
+        try:
+            watch_repo(
+                repo,
+                lambda state: write_outputs(state, render_report(state), output, routes_json),
+                jobs=jobs,
+                debounce_seconds=args.debounce_ms / 1000.0,
+                poll_seconds=args.poll_seconds,
+                use_git=args.git,
+                max_file_bytes=args.max_file_bytes,
+                term_capacity=args.term_capacity,
+                dedup=not args.no_dedup,
+                read_threads=args.read_threads,
+            )
+        except ValueError as exc:
+            print(f"ERROR: {exc}")
+            return 2
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    started = time.perf_counter()
+    cache_dir = Path(args.cache_dir) if args.cache_dir else None
+    try:
+        if archive:
+            state = scan_archive(
+                repo,
+                max_file_bytes=args.max_file_bytes,
+                term_capacity=args.term_capacity,
+                profile=args.profile,
+                dedup=not args.no_dedup,
+            )
+        else:
+            state = scan_repo(
+                repo,
+                jobs=jobs,
+                cache_dir=cache_dir,
+                cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+                use_git=args.git,
+                since=args.since,
+                save_baseline=args.save_baseline,
+                max_file_bytes=args.max_file_bytes,
+                term_capacity=args.term_capacity,
+                profile=args.profile,
+                dedup=not args.no_dedup,
+                read_threads=args.read_threads,
+                stack_only=args.stack_only,
+                max_seconds=args.max_seconds,
+                max_files=args.max_files,
+                early_stop=args.early_stop,
+            )
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        return 2
+
+    render_started = time.perf_counter()
+    report = render_report(state)
+    if args.profile:
+        state["profile"]["phases"]["render"][0] += time.perf_counter() - render_started
+        profile_text = render_profile(
+            state["profile"], time.perf_counter() - started, args.profile_top, str(repo)
+        )
+        print(profile_text, file=sys.stderr)
+    write_outputs(state, report, output, routes_json)
     return 0
 
 
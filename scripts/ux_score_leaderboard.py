@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Score many run-artifacts folders in parallel and write a CSV or JSONL leaderboard.
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import ux_spec_score  # noqa: E402
+
+
+ORDERINGS = ["completion", "run", "score"]
+
+CSV_COLUMNS = ["run_id", "path", "status", "score", "passed", "files", "seconds"]
+
+WORKER_CACHE: Optional[dict] = None
+
+
+def expand_run_paths(patterns: list[str], parents: list[str], list_file: str = "") -> list[str]:
+    entries = list(patterns)
+    if list_file:
+        for line in Path(list_file).read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                entries.append(line)
+    for parent in parents:
+        entries.extend(str(child) for child in Path(os.path.expanduser(parent)).iterdir() if child.is_dir())
+
+    runs = set()
+    for entry in entries:
+        matches = glob.glob(os.path.expanduser(entry)) if glob.has_magic(entry) else [entry]
+        for match in matches:
+            path = Path(os.path.expanduser(match))
+            if path.is_dir():
+                runs.add(str(path.resolve()))
+    return sorted(runs)
+
+
+def init_worker(cache_path: str, fingerprint: str) -> None:
+    global WORKER_CACHE
+    WORKER_CACHE = ux_spec_score.load_score_cache(Path(cache_path), fingerprint) if cache_path else None
+
+
+def score_run(run: str, min_score: int) -> tuple[dict, dict]:
+    started = time.perf_counter()
+    record = {"run_id": Path(run).name, "path": run}
+    added: dict[str, dict] = {}
+    try:
+        _, file_hits = ux_spec_score.match_path(Path(run), cache=WORKER_CACHE, added=added)
+        score, results = ux_spec_score.CHECK_MATCHER.score_hits(ux_spec_score.merge_hits(file_hits))
+    except Exception as exc:
+        record.update(status="error", error=f"{type(exc).__name__}: {exc}")
+    else:
+        record.update(
+            status="ok",
+            score=score,
+            passed=score >= min_score,
+            files=len(file_hits),
+            checks={name: passed for name, _, passed in results},
+        )
+    record["seconds"] = round(time.perf_counter() - started, 4)
+    return record, added
+
+
+def sort_records(records: list[dict], ordering: str) -> list[dict]:
+    if ordering == "run":
+        return sorted(records, key=lambda record: (record["run_id"], record["path"]))
+    if ordering == "score":
+        return sorted(records, key=lambda record: (-record.get("score", -1), record["run_id"], record["path"]))
+    return records
+
+
+def iter_pool_results(function, items: list, jobs: int, initargs: tuple, *args):
+    queue = deque(items)
+    suspects: deque = deque()
+    while queue or suspects:
+        while suspects:
+            item = suspects.popleft()
+            with ProcessPoolExecutor(max_workers=1, initializer=init_worker, initargs=initargs) as pool:
+                future = pool.submit(function, item, *args)
+                try:
+                    yield item, future.result(), None
+                except BrokenProcessPool as exc:
+                    yield item, None, f"worker crashed: {exc}"
+                except Exception as exc:
+                    yield item, None, f"worker failed: {exc}"
+
+        broken = False
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=initargs) as pool:
+            in_flight = {}
+            while in_flight or (queue and not broken):
+                while queue and not broken and len(in_flight) < jobs:
+                    item = queue.popleft()
+                    in_flight[pool.submit(function, item, *args)] = item
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        suspects.append(item)
+                        continue
+                    except Exception as exc:
+                        yield item, None, f"worker failed: {exc}"
+                        continue
+                    yield item, result, None
+
+
+class LeaderboardWriter:
+    def __init__(self, handle, output_format: str):
+        self.handle = handle
+        self.check_names = [name for name, _, _ in ux_spec_score.CHECKS]
+        self.csv = None
+        if output_format == "csv":
+            self.csv = csv.writer(handle)
+            self.csv.writerow(CSV_COLUMNS + self.check_names + ["error"])
+
+    def write(self, record: dict) -> None:
+        if self.csv is None:
+            self.handle.write(json.dumps(record, sort_keys=True) + "\n")
+        else:
+            checks = record.get("checks", {})
+            row = [record.get(column, "") for column in CSV_COLUMNS]
+            row += [("PASS" if checks[name] else "FAIL") if name in checks else "" for name in self.check_names]
+            self.csv.writerow(row + [record.get("error", "")])
+        self.handle.flush()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Score many run-artifacts folders into a leaderboard.")
+    parser.add_argument("runs", nargs="*", help="Run folders or globs (for example run-artifacts/*)")
+    parser.add_argument(
+        "--parent",
+        action="append",
+        default=[],
+        help="Directory whose subdirectories are all runs (repeatable)",
+    )
+    parser.add_argument("--list", default="", help="File with one run folder or glob per line")
+    parser.add_argument("--output", required=True, help="Leaderboard path (.csv or .jsonl)")
+    parser.add_argument(
+        "--format",
+        choices=["csv", "jsonl"],
+        default="",
+        help="Output format (default: from the --output suffix)",
+    )
+    parser.add_argument("--min-score", type=int, default=80, help="Minimum passing score")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes, one run each (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--order",
+        choices=ORDERINGS,
+        default="completion",
+        help="Row order: as runs finish, by run id, or by score then run id",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for the per-file keyword hit cache shared with ux_spec_score.py",
+    )
+    args = parser.parse_args()
+
+    if args.jobs < 0:
+        print("ERROR: --jobs must be 0 or a positive integer")
+        return 2
+    output = Path(args.output)
+    output_format = args.format or output.suffix.lower().lstrip(".")
+    if output_format not in ("csv", "jsonl"):
+        print("ERROR: --output must end in .csv or .jsonl, or pass --format")
+        return 2
+    if args.list and not Path(args.list).is_file():
+        print(f"ERROR: run list is invalid: {args.list}")
+        return 2
+    for parent in args.parent:
+        if not Path(os.path.expanduser(parent)).is_dir():
+            print(f"ERROR: parent directory is invalid: {parent}")
+            return 2
+
+    runs = expand_run_paths(args.runs, args.parent, args.list)
+    if not runs:
+        print("ERROR: no run directories matched")
+        return 2
+
+    cache_path = ""
+    fingerprint = ux_spec_score.checks_fingerprint(ux_spec_score.CHECKS)
+    cache: dict[str, dict] = {}
+    if args.cache_dir:
+        cache_path = str(Path(args.cache_dir) / ux_spec_score.CACHE_FILENAME)
+        cache = ux_spec_score.load_score_cache(Path(cache_path), fingerprint)
+
+    errors = 0
+    added_entries = 0
+    buffered = []
+    jobs = args.jobs or os.cpu_count() or 1
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8", newline="") as handle:
+        writer = LeaderboardWriter(handle, output_format)
+        results = iter_pool_results(score_run, runs, jobs, (cache_path, fingerprint), args.min_score)
+        for done, (run, result, failure) in enumerate(results, start=1):
+            if failure is None:
+                record, added = result
+                cache.update(added)
+                added_entries += len(added)
+            else:
+                record = {"run_id": Path(run).name, "path": run, "status": "error", "error": failure, "seconds": 0.0}
+            if record["status"] != "ok":
+                errors += 1
+            if args.order == "completion":
+                writer.write(record)
+            else:
+                buffered.append(record)
+            print(f"[{done}/{len(runs)}] {record['status']}: {record['run_id']} {record.get('score', '')}".rstrip())
+        for record in sort_records(buffered, args.order):
+            writer.write(record)
+
+    if cache_path and added_entries:
+        ux_spec_score.save_score_cache(Path(cache_path), fingerprint, cache)
+    print(f"Wrote {len(runs)} rows to {output} ({errors} errors)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,11 +4,17 @@ Score a markdown UX spec against this skill's mandatory quality criteria.
 """
 
 import argparse
+import hashlib
+import json
+import os
 import sys
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
+CACHE_VERSION = 2
+CACHE_FILENAME = "score-cache.json"
+
 CHECKS = [
     (
         "problem_framing",
@@ -228,29 +234,99 @@ CHECKS = [
 ]
 
 
-def has_keywords(text: str, keywords: List[str], min_hits: Optional[int] = None) -> bool:
-    hits = sum(1 for keyword in keywords if keyword in text)
-    if min_hits is None:
-        min_hits = max(1, len(keywords) // 2)
-    return hits >= min_hits
+class CheckMatcher:
+    """
+    A checks table compiled once: every distinct keyword gets one bit and a text is matched
+    into a single keyword bitmask that all checks are evaluated against. The search that
+    decides each bit also yields the keyword's first offset, so locations cost nothing extra.
+    """
 
+    def __init__(self, checks: List[Tuple[str, int, List[str]]]):
+        self.checks = checks
+        self.keywords = sorted({keyword for _, _, keywords in checks for keyword in keywords})
+        self.bits: Dict[str, int] = {keyword: 1 << index for index, keyword in enumerate(self.keywords)}
+        self.rules = [
+            (name, points, [self.bits[keyword] for keyword in keywords], max(1, len(keywords) // 2))
+            for name, points, keywords in checks
+        ]
 
-def score_content(content: str) -> Tuple[int, List[Tuple[str, int, bool]]]:
-    text = content.lower()
-    total = 0
-    results = []
-    for name, points, keywords in CHECKS:
-        passed = has_keywords(text, keywords)
-        if passed:
-            total += points
-        results.append((name, points, passed))
-    return total, results
+    def locate(self, text: str) -> Dict[str, int]:
+        offsets = {}
+        for keyword in self.keywords:
+            offset = text.find(keyword)
+            if offset >= 0:
+                offsets[keyword] = offset
+        return offsets
 
+    def mask(self, keywords) -> int:
+        hits = 0
+        for keyword in keywords:
+            hits |= self.bits.get(keyword, 0)
+        return hits
 
-def load_content(path: Path) -> Tuple[str, str]:
-    if path.is_file():
-        return path.read_text(encoding="utf-8", errors="ignore"), str(path)
+    def match(self, text: str) -> int:
+        return self.mask(self.locate(text))
+
+    def score_hits(self, hits: int) -> Tuple[int, List[Tuple[str, int, bool]]]:
+        total = 0
+        results = []
+        for name, points, bits, min_hits in self.rules:
+            passed = sum(1 for bit in bits if hits & bit) >= min_hits
+            if passed:
+                total += points
+            results.append((name, points, passed))
+        return total, results
+
+    def hit_checks(self, hits: int) -> List[str]:
+        return [name for name, _, bits, _ in self.rules if any(hits & bit for bit in bits)]
+
+    def explain(self, file_hits: List[Tuple[str, int, Dict[str, Tuple[int, int]]]]) -> List[dict]:
+        locations: Dict[str, List[Tuple[str, int, int]]] = {}
+        for rel, _, positions in file_hits:
+            for keyword, (line, column) in positions.items():
+                locations.setdefault(keyword, []).append((rel, line, column))
+        hits = merge_hits(file_hits)
+        explained = []
+        for (name, points, bits, min_hits), (_, _, keywords) in zip(self.rules, self.checks):
+            found = sum(1 for bit in bits if hits & bit)
+            present = [keyword for keyword in keywords if hits & self.bits[keyword]]
+            explained.append(
+                {
+                    "check": name,
+                    "points": points,
+                    "passed": found >= min_hits,
+                    "found": found,
+                    "needed": min_hits,
+                    "keywords": len(keywords),
+                    "present": [(keyword, locations.get(keyword, [])) for keyword in present],
+                    "missing": [keyword for keyword in keywords if keyword not in present],
+                }
+            )
+        return explained
+
+
+CHECK_MATCHER = CheckMatcher(CHECKS)
+
+
+def score_content(
+    content: str, matcher: Optional[CheckMatcher] = None
+) -> Tuple[int, List[Tuple[str, int, bool]]]:
+    matcher = matcher or CHECK_MATCHER
+    return matcher.score_hits(matcher.match(content.lower()))
 
+
+def line_columns(text: str, offsets: Dict[str, int], first_line: int = 1) -> Dict[str, Tuple[int, int]]:
+    positions = {}
+    line = first_line
+    last = 0
+    for keyword, offset in sorted(offsets.items(), key=lambda item: item[1]):
+        line += text.count("\n", last, offset)
+        last = offset
+        positions[keyword] = (line, offset - text.rfind("\n", 0, offset))
+    return positions
+
+
+def markdown_files(path: Path) -> List[Path]:
     if not path.is_dir():
         raise ValueError("Path must be a markdown file or directory.")
 
@@ -260,7 +336,14 @@ def load_content(path: Path) -> Tuple[str, str]:
     )
     if not md_files:
         raise ValueError("Directory contains no markdown files (*.md).")
+    return md_files
 
+
+def load_content(path: Path) -> Tuple[str, str]:
+    if path.is_file():
+        return path.read_text(encoding="utf-8", errors="ignore"), str(path)
+
+    md_files = markdown_files(path)
     sections = []
     for md_file in md_files:
         rel = md_file.relative_to(path)
@@ -271,10 +354,103 @@ def load_content(path: Path) -> Tuple[str, str]:
     return combined, target
 
 
+def checks_fingerprint(checks: List[Tuple[str, int, List[str]]]) -> str:
+    payload = json.dumps([CACHE_VERSION, checks], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_score_cache(cache_path: Path, fingerprint: str) -> Dict[str, dict]:
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_score_cache(cache_path: Path, fingerprint: str, entries: Dict[str, dict]) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    payload = {"version": CACHE_VERSION, "fingerprint": fingerprint, "entries": entries}
+    tmp_path.write_text(json.dumps(payload, sort_keys=True, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+
+
+def match_file(
+    md_file: Path,
+    header: Optional[str] = None,
+    matcher: Optional[CheckMatcher] = None,
+    cache: Optional[Dict[str, dict]] = None,
+    added: Optional[Dict[str, dict]] = None,
+) -> Tuple[int, Dict[str, Tuple[int, int]]]:
+    matcher = matcher or CHECK_MATCHER
+    data = md_file.read_bytes()
+    positions: Dict[str, Tuple[int, int]] = {}
+    if header is not None:
+        header_line = "## FILE: {0}".format(header).lower()
+        positions.update(line_columns(header_line, matcher.locate(header_line), first_line=0))
+    digest = hashlib.sha256(data).hexdigest() if cache is not None else ""
+    cached = cache.get(digest) if cache is not None else None
+    if isinstance(cached, dict) and isinstance(cached.get("at"), dict):
+        content_positions = {keyword: (line, column) for keyword, (line, column) in cached["at"].items()}
+    else:
+        text = data.decode("utf-8", errors="ignore").lower()
+        content_positions = line_columns(text, matcher.locate(text))
+        if cache is not None:
+            entry = {"at": {keyword: list(position) for keyword, position in content_positions.items()}}
+            cache[digest] = entry
+            if added is not None:
+                added[digest] = entry
+    for keyword, position in content_positions.items():
+        positions.setdefault(keyword, position)
+    return matcher.mask(positions), positions
+
+
+def match_path(
+    path: Path,
+    matcher: Optional[CheckMatcher] = None,
+    cache: Optional[Dict[str, dict]] = None,
+    added: Optional[Dict[str, dict]] = None,
+) -> Tuple[str, List[Tuple[str, int, Dict[str, Tuple[int, int]]]]]:
+    if path.is_file():
+        return str(path), [(path.name,) + match_file(path, None, matcher, cache, added)]
+
+    md_files = markdown_files(path)
+    file_hits = []
+    for md_file in md_files:
+        rel = md_file.relative_to(path)
+        file_hits.append((str(rel),) + match_file(md_file, str(rel), matcher, cache, added))
+    target = "{0} (combined {1} markdown files)".format(path, len(md_files))
+    return target, file_hits
+
+
+def merge_hits(file_hits: List[Tuple[str, int, Dict[str, Tuple[int, int]]]]) -> int:
+    hits = 0
+    for _, file_mask, _ in file_hits:
+        hits |= file_mask
+    return hits
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Score a UX markdown spec.")
     parser.add_argument("spec_path", help="Path to markdown spec file or artifact directory")
     parser.add_argument("--min-score", type=int, default=80, help="Minimum passing score")
+    parser.add_argument(
+        "--by-file",
+        action="store_true",
+        help="For artifact directories, list the checks each markdown file has keywords for",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for the per-file keyword hit cache, keyed by content hash and CHECKS",
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="List present and missing keywords for each check, with file:line:column locations",
+    )
     args = parser.parse_args()
 
     path = Path(args.spec_path)
@@ -282,13 +458,20 @@ def main() -> int:
         print(f"ERROR: File not found: {path}")
         return 2
 
+    cache_path = Path(args.cache_dir) / CACHE_FILENAME if args.cache_dir else None
+    fingerprint = checks_fingerprint(CHECKS)
+    cache = load_score_cache(cache_path, fingerprint) if cache_path else None
+    added: Dict[str, dict] = {}
+
     try:
-        content, target = load_content(path)
+        target, file_hits = match_path(path, cache=cache, added=added)
     except ValueError as exc:
         print(f"ERROR: {exc}")
         return 2
+    if cache_path and added:
+        save_score_cache(cache_path, fingerprint, cache)
 
-    score, results = score_content(content)
+    score, results = CHECK_MATCHER.score_hits(merge_hits(file_hits))
 
     print(f"Spec: {target}")
     print(f"Score: {score}/100")
@@ -298,6 +481,28 @@ def main() -> int:
         status = "PASS" if passed else "FAIL"
         print(f"- {name}: {status} ({points} pts)")
 
+    if args.by_file and path.is_dir():
+        print("\nFile attribution:")
+        for rel, hits, _ in file_hits:
+            checks = CHECK_MATCHER.hit_checks(hits)
+            print(f"- {rel}: {', '.join(checks) if checks else 'no check keywords'}")
+
+    if args.explain:
+        print("\nExplain:")
+        for entry in CHECK_MATCHER.explain(file_hits):
+            status = "PASS" if entry["passed"] else "FAIL"
+            print(
+                f"- {entry['check']}: {status}, {entry['found']} of {entry['keywords']} keywords "
+                f"(needs {entry['needed']})"
+            )
+            for keyword, found_at in entry["present"]:
+                rel, line, column = found_at[0]
+                where = f"{rel} (file name)" if line == 0 else f"{rel}:{line}:{column}"
+                more = f" (+{len(found_at) - 1} more files)" if len(found_at) > 1 else ""
+                print(f"  - present: {keyword!r} at {where}{more}")
+            for keyword in entry["missing"]:
+                print(f"  - missing: {keyword!r}")
+
     if score >= args.min_score:
         print("\nResult: PASS")
         return 0